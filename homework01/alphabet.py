@@ -0,0 +1,208 @@
+import threading
+import typing as tp
+
+Fallback = tp.Callable[[str], str]
+BytesLike = tp.Union[bytes, bytearray, memoryview]
+
+# Bytes translated per step by translate_periodic_into, bounds its temporaries.
+BLOCK_SIZE = 1 << 16
+# Scratch buffer of translate_periodic_into, one per thread.
+_local = threading.local()
+
+
+class ShiftTable(dict):
+    """
+    Translation table for str.translate.
+
+    Letters of the alphabet are filled in up front. Any other character
+    is resolved on first use, with fallback if there is one or as itself
+    otherwise, and remembered.
+    """
+
+    def __init__(self, mapping: tp.Dict[int, int], fallback: tp.Optional[Fallback] = None) -> None:
+        super().__init__(mapping)
+        self.fallback = fallback
+        self._byte_tables: tp.Dict[str, tp.Optional[bytes]] = {}
+
+    def __missing__(self, code: int) -> int:
+        value = ord(self.fallback(chr(code))) if self.fallback is not None else code
+        self[code] = value
+        return value
+
+    def byte_table(self, codec: str) -> tp.Optional[bytes]:
+        """
+        The same table over the bytes of a single-byte codec, None if some
+        character maps outside of the codec.
+        """
+        if codec not in self._byte_tables:
+            table = bytearray(range(256))
+            try:
+                for code, char in enumerate(bytes(range(256)).decode(codec, errors="replace")):
+                    if char != "�":
+                        table[code] = ord(chr(self[ord(char)]).encode(codec))
+                self._byte_tables[codec] = bytes(table)
+            except (UnicodeEncodeError, TypeError):
+                self._byte_tables[codec] = None
+        return self._byte_tables[codec]
+
+
+class Alphabet:
+    """
+    Ordered letters of an alphabet compiled into index lookup tables.
+
+    >>> alphabet = Alphabet("abc")
+    >>> alphabet.index("C")
+    2
+    >>> "Bad".translate(alphabet.shift_table(1))
+    'Cbd'
+    """
+
+    def __init__(self, lower: str, upper: tp.Optional[str] = None, codec: tp.Optional[str] = None) -> None:
+        upper = lower.upper() if upper is None else upper
+        if len(upper) != len(lower) or len(set(lower)) != len(lower):
+            raise ValueError("alphabet letters must be unique and come in lower/upper pairs")
+        self.lower = lower
+        self.upper = upper
+        # Single-byte codec that covers the alphabet, enables bytes.translate on encoded text.
+        self.codec = codec
+        self._index = {letter: i for i, letter in enumerate(lower)}
+        self._index.update({letter: i for i, letter in enumerate(upper)})
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+    def __contains__(self, char: object) -> bool:
+        return char in self._index
+
+    def __repr__(self) -> str:
+        return f"Alphabet({self.lower!r})"
+
+    def index(self, char: str) -> int:
+        try:
+            return self._index[char]
+        except KeyError:
+            raise ValueError(f"{char!r} is not in {self!r}") from None
+
+    def shift_table(
+        self, shift: int, upper_shift: tp.Optional[int] = None, fallback: tp.Optional[Fallback] = None
+    ) -> ShiftTable:
+        """Table that moves every letter shift places forward, capital letters by upper_shift if given."""
+        upper_shift = shift if upper_shift is None else upper_shift
+        size = len(self)
+        mapping = {ord(letter): ord(self.lower[(i + shift) % size]) for i, letter in enumerate(self.lower)}
+        mapping.update({ord(letter): ord(self.upper[(i + upper_shift) % size]) for i, letter in enumerate(self.upper)})
+        return ShiftTable(mapping, fallback)
+
+
+LATIN = Alphabet("abcdefghijklmnopqrstuvwxyz", codec="ascii")
+CYRILLIC = Alphabet("абвгдежзийклмнопрстуфхцчшщъыьэюя", codec="cp1251")
+CYRILLIC_YO = Alphabet("абвгдеёжзийклмнопрстуфхцчшщъыьэюя", codec="cp1251")
+
+
+def translate_periodic(
+    text: str, tables: tp.Sequence[ShiftTable], offset: int = 0, codec: tp.Optional[str] = None
+) -> str:
+    """
+    Translates character i of text with tables[(offset + i) % len(tables)].
+
+    When codec is given and the text and all tables fit into it, the work
+    is done with bytes.translate on the encoded text.
+
+    >>> tables = [LATIN.shift_table(0), LATIN.shift_table(1)]
+    >>> translate_periodic("aaaa", tables, offset=1)
+    'baba'
+    """
+    period = len(tables)
+    if codec is not None and text:
+        byte_tables = [table.byte_table(codec) for table in tables]
+        try:
+            data = text.encode(codec)
+        except UnicodeEncodeError:
+            data = None
+        if data is not None and all(table is not None for table in byte_tables):
+            return translate_periodic_bytes(data, tp.cast(tp.List[bytes], byte_tables), offset).decode(codec)
+    if period == 1:
+        return text.translate(tables[0])
+    # Interleave through UTF-32, where every character is 4 bytes, so the
+    # strided writes stay in bytearray slices instead of a list of chars.
+    out = bytearray(4 * len(text))
+    for i in range(min(period, len(text))):
+        part = text[i::period].translate(tables[(offset + i) % period]).encode("utf-32-le", "surrogatepass")
+        for lane in range(4):
+            out[4 * i + lane :: 4 * period] = part[lane::4]
+    return out.decode("utf-32-le", "surrogatepass")
+
+
+def translate_periodic_bytes(data: bytes, tables: tp.Sequence[bytes], offset: int = 0) -> bytes:
+    """Translates byte i of data with tables[(offset + i) % len(tables)]."""
+    period = len(tables)
+    if period == 1:
+        return data.translate(tables[0])
+    out = bytearray(len(data))
+    for i in range(min(period, len(data))):
+        out[i::period] = data[i::period].translate(tables[(offset + i) % period])
+    return bytes(out)
+
+
+def translate_periodic_into(
+    data: BytesLike, tables: tp.Sequence[bytes], out: tp.Optional[BytesLike] = None, offset: int = 0
+) -> int:
+    """
+    Same as translate_periodic_bytes, but writes into out, or back into
+    data when out is None. Returns the number of bytes written.
+
+    Works block by block with a BLOCK_SIZE scratch buffer reused by every
+    call in the thread. bytes.translate has no in-place form, so each
+    block still allocates a copy of the input and, per keyword phase, the
+    stripe and its translation, none of them larger than BLOCK_SIZE.
+
+    >>> buffer = bytearray(b"aaaa")
+    >>> translate_periodic_into(buffer, [bytes(range(256)), bytes(range(1, 256)) + b"\\0"])
+    4
+    >>> buffer
+    bytearray(b'abab')
+    """
+    with memoryview(data) as src_view, src_view.cast("B") as src:
+        with memoryview(data if out is None else out) as dst_view, dst_view.cast("B") as dst:
+            return _translate_blocks(src, dst, tables, offset)
+
+
+def _translate_blocks(src: memoryview, dst: memoryview, tables: tp.Sequence[bytes], offset: int) -> int:
+    size = src.nbytes
+    if dst.nbytes < size:
+        raise ValueError("output buffer is smaller than the input")
+    period = len(tables)
+    # Strided writes are much faster into a bytearray than into a memoryview.
+    scratch = getattr(_local, "scratch", None)
+    if scratch is None:
+        scratch = _local.scratch = bytearray(BLOCK_SIZE)
+    for start in range(0, size, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, size)
+        block = src[start:stop].tobytes()
+        if period == 1:
+            dst[start:stop] = block.translate(tables[0])
+            continue
+        length = stop - start
+        for i in range(min(period, length)):
+            scratch[i:length:period] = block[i::period].translate(tables[(offset + start + i) % period])
+        with memoryview(scratch)[:length] as translated:
+            dst[start:stop] = translated
+    return size
+
+
+def read_chunks(src: tp.IO, chunk_size: int) -> tp.Iterator:
+    """Reads src with read(chunk_size) until it returns nothing."""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_chunks(dst: tp.IO, chunks: tp.Iterable[tp.AnyStr]) -> int:
+    """Writes every chunk to dst, returns the number of characters (or bytes) written."""
+    written = 0
+    for chunk in chunks:
+        dst.write(chunk)
+        written += len(chunk)
+    return written
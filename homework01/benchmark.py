@@ -0,0 +1,188 @@
+import argparse
+import functools
+import importlib
+import json
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+import typing as tp
+
+import caesar
+import rsa
+import vigenere
+
+growing_shift = importlib.import_module("защита01")
+
+SIZES = [1 << 10, 1 << 16, 1 << 20, 16 << 20, 100 << 20]
+MIXES = {
+    "letters": string.ascii_letters,
+    "mixed": string.ascii_letters + string.digits + string.punctuation + " " * 10 + "\n",
+    "cyrillic": "абвгдеёжзийклмнопрстуфхцчшщъыьэюяАБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ" + " " * 10,
+}
+KEY_LENGTHS = [1, 8, 64]
+# Toy keypair (p=61, q=53), the per-character RSA is too slow for large inputs.
+RSA_PUBLIC = (17, 3233)
+RSA_PRIVATE = (2753, 3233)
+RSA_MAX_SIZE = 1 << 16
+# Per-character and block mode are compared on a generated key of this size.
+RSA_KEY_SIZE = 1024
+RSA_CHAR_MAX_SIZE = 1 << 10
+RSA_BLOCK_MAX_SIZE = 1 << 16
+THRESHOLD = 0.2
+
+
+class Result(tp.NamedTuple):
+    name: str
+    mix: str
+    size: int
+    key_length: int
+    seconds: float
+    mb_per_s: float
+    peak_bytes: int
+
+    @property
+    def case_id(self) -> str:
+        return f"{self.name}/{self.mix}/{self.size}/{self.key_length}"
+
+
+def _text(mix: str, size: int) -> str:
+    rng = random.Random(size)
+    block = "".join(rng.choice(MIXES[mix]) for _ in range(min(size, 1 << 16)))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def _keyword(length: int) -> str:
+    rng = random.Random(length)
+    return "".join(rng.choice(string.ascii_letters) for _ in range(length))
+
+
+@functools.lru_cache(maxsize=None)
+def _rsa_keypair() -> tp.Tuple[tp.Tuple[int, int], rsa.PrivateKey]:
+    return rsa.generate_keypair(bits=RSA_KEY_SIZE)
+
+
+def _codebook_encrypt(pk: tp.Tuple[int, int], text: str) -> tp.List[int]:
+    # A fresh codebook every time, so the first use of each symbol is measured as well.
+    return rsa.Codebook(pk).encrypt(text)
+
+
+def _codebook_decrypt(pk: rsa.PrivateKey, ciphertext: tp.List[int]) -> str:
+    return rsa.Codebook(pk).decrypt(ciphertext)
+
+
+def _cases(text: str, key_lengths: tp.Sequence[int]) -> tp.Iterator[tp.Tuple[str, int, tp.Callable[[], tp.Any]]]:
+    yield "encrypt_caesar", 1, functools.partial(caesar.encrypt_caesar, text)
+    yield "decrypt_caesar", 1, functools.partial(caesar.decrypt_caesar, caesar.encrypt_caesar(text))
+    for length in key_lengths:
+        keyword = _keyword(length)
+        ciphertext = vigenere.encrypt_vigenere(text, keyword)
+        yield "encrypt_vigenere", length, functools.partial(vigenere.encrypt_vigenere, text, keyword)
+        yield "decrypt_vigenere", length, functools.partial(vigenere.decrypt_vigenere, ciphertext, keyword)
+    yield "encrypt_growing_shift", 1, functools.partial(growing_shift.encrypt_growing_shift, text, 1, 3)
+    if len(text) <= RSA_MAX_SIZE:
+        yield "rsa_encrypt", 1, functools.partial(rsa.encrypt, RSA_PUBLIC, text)
+        yield "rsa_decrypt", 1, functools.partial(rsa.decrypt, RSA_PRIVATE, rsa.encrypt(RSA_PUBLIC, text))
+    public, private = _rsa_keypair()
+    if len(text) <= RSA_CHAR_MAX_SIZE:
+        yield "rsa_encrypt_chars", RSA_KEY_SIZE, functools.partial(rsa.encrypt, public, text)
+        yield "rsa_decrypt_chars", RSA_KEY_SIZE, functools.partial(rsa.decrypt, private, rsa.encrypt(public, text))
+    if len(text) <= RSA_BLOCK_MAX_SIZE:
+        codebook_ciphertext = _codebook_encrypt(public, text)
+        yield "rsa_encrypt_codebook", RSA_KEY_SIZE, functools.partial(_codebook_encrypt, public, text)
+        yield "rsa_decrypt_codebook", RSA_KEY_SIZE, functools.partial(_codebook_decrypt, private, codebook_ciphertext)
+        yield "rsa_encrypt_blocks", RSA_KEY_SIZE, functools.partial(rsa.encrypt_blocks, public, text)
+        yield "rsa_decrypt_blocks", RSA_KEY_SIZE, functools.partial(
+            rsa.decrypt_blocks, private, rsa.encrypt_blocks(public, text)
+        )
+
+
+def _measure(func: tp.Callable[[], tp.Any], repeat: int) -> tp.Tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(
+    sizes: tp.Sequence[int] = tuple(SIZES),
+    mixes: tp.Sequence[str] = tuple(MIXES),
+    key_lengths: tp.Sequence[int] = tuple(KEY_LENGTHS),
+    repeat: int = 3,
+) -> tp.List[Result]:
+    """Runs every cipher over every size, character mix and key length, best time of repeat runs."""
+    results = []
+    for mix in mixes:
+        for size in sizes:
+            text = _text(mix, size)
+            for name, key_length, func in _cases(text, key_lengths):
+                seconds, peak = _measure(func, repeat if size < (16 << 20) else 1)
+                mb_per_s = len(text.encode()) / (1 << 20) / seconds if seconds else float("inf")
+                results.append(Result(name, mix, size, key_length, seconds, mb_per_s, peak))
+    return results
+
+
+def to_json(results: tp.Sequence[Result]) -> tp.Dict[str, tp.Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [dict(result._asdict(), case_id=result.case_id) for result in results],
+    }
+
+
+def find_regressions(
+    results: tp.Sequence[Result], baseline: tp.Dict[str, tp.Any], threshold: float = THRESHOLD
+) -> tp.List[str]:
+    """Cases whose throughput dropped more than threshold below the baseline."""
+    previous = {case["case_id"]: case["mb_per_s"] for case in baseline["results"]}
+    regressions = []
+    for result in results:
+        if result.case_id in previous and result.mb_per_s < previous[result.case_id] * (1 - threshold):
+            regressions.append(
+                f"{result.case_id}: {result.mb_per_s:.2f} MB/s, baseline {previous[result.case_id]:.2f} MB/s"
+            )
+    return regressions
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput benchmark for the homework01 ciphers.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="input sizes in characters")
+    parser.add_argument("--mixes", nargs="+", default=list(MIXES), choices=list(MIXES))
+    parser.add_argument("--key-lengths", type=int, nargs="+", default=KEY_LENGTHS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.mixes, args.key_lengths, args.repeat)
+    for result in results:
+        print(
+            f"{result.name:22} {result.mix:9} {result.size:>10} key={result.key_length:<3} "
+            f"{result.mb_per_s:10.2f} MB/s peak {result.peak_bytes / (1 << 20):8.2f} MB"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(to_json(results), f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,113 @@
+import collections
+import functools
+import typing as tp
+
+from alphabet import (
+    LATIN,
+    Alphabet,
+    BytesLike,
+    ShiftTable,
+    read_chunks,
+    translate_periodic,
+    translate_periodic_into,
+    write_chunks,
+)
+
+KEY_CACHE_SIZE = 4096
+
+
+def _shift_char(char: str, shift: int) -> str:
+    if char.isalpha():
+        start = ord("a") if char.islower() else ord("A")
+        return chr((ord(char) - start + shift) % 26 + start)
+    return char
+
+
+class CaesarKey:
+    """
+    Caesar shift compiled into translation tables.
+
+    Without an alphabet ASCII letters are shifted and other letters keep
+    the behaviour of encrypt_caesar. With one, its letters are shifted
+    and everything else is left as is.
+
+    >>> key = CaesarKey(3)
+    >>> key.encrypt("Python3.6")
+    'Sbwkrq3.6'
+    >>> key.decrypt_bytes(b"Sbwkrq3.6")
+    b'Python3.6'
+    >>> import alphabet
+    >>> CaesarKey(1, alphabet.CYRILLIC).encrypt("Ярд, bar")
+    'Асе, bar'
+    """
+
+    def __init__(self, shift: int = 3, alphabet: tp.Optional[Alphabet] = None) -> None:
+        self.alphabet = alphabet
+        self.shift = shift % len(alphabet or LATIN)
+        if alphabet is None:
+            self._encrypt_table = LATIN.shift_table(
+                self.shift, fallback=functools.partial(_shift_char, shift=self.shift)
+            )
+            self._decrypt_table = LATIN.shift_table(
+                -self.shift, fallback=functools.partial(_shift_char, shift=-self.shift)
+            )
+        else:
+            self._encrypt_table = alphabet.shift_table(self.shift)
+            self._decrypt_table = alphabet.shift_table(-self.shift)
+        self._codec = (alphabet or LATIN).codec
+
+    def encrypt(self, plaintext: str) -> str:
+        return translate_periodic(plaintext, [self._encrypt_table], codec=self._codec)
+
+    def decrypt(self, ciphertext: str) -> str:
+        return translate_periodic(ciphertext, [self._decrypt_table], codec=self._codec)
+
+    def _byte_table(self, table: ShiftTable) -> bytes:
+        byte_table = table.byte_table(self._codec) if self._codec else None
+        if byte_table is None:
+            raise ValueError(f"{self.alphabet!r} has no single-byte encoding")
+        return byte_table
+
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Shifts letters encoded with the alphabet codec (ASCII by default), every other byte is left as is."""
+        return data.translate(self._byte_table(self._encrypt_table))
+
+    def decrypt_bytes(self, data: bytes) -> bytes:
+        return data.translate(self._byte_table(self._decrypt_table))
+
+    def encrypt_into(self, data: BytesLike, out: tp.Optional[BytesLike] = None) -> int:
+        """
+        Encrypts a buffer in place, or into out when given, and returns
+        the number of bytes written. Temporaries stay within BLOCK_SIZE, see
+        translate_periodic_into.
+
+        >>> buffer = bytearray(b"Python3.6")
+        >>> CaesarKey(3).encrypt_into(memoryview(buffer)[:6])
+        6
+        >>> buffer
+        bytearray(b'Sbwkrq3.6')
+        """
+        return translate_periodic_into(data, [self._byte_table(self._encrypt_table)], out)
+
+    def decrypt_into(self, data: BytesLike, out: tp.Optional[BytesLike] = None) -> int:
+        return translate_periodic_into(data, [self._byte_table(self._decrypt_table)], out)
+
+
+def compile_caesar(shift: int = 3, alphabet: tp.Optional[Alphabet] = None) -> CaesarKey:
+    """Compiled keys are kept in an LRU cache of KEY_CACHE_SIZE entries, see caesar_cache_info."""
+    return _compile_caesar(shift % len(alphabet or LATIN), alphabet)
+
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile_caesar(shift: int, alphabet: tp.Optional[Alphabet]) -> CaesarKey:
+    return CaesarKey(shift, alphabet)
+
+
+def caesar_cache_info() -> "functools._CacheInfo":
+    """Hits, misses and current size of the compiled key cache."""
+    return _compile_caesar.cache_info()
+
+
 def encrypt_caesar(plaintext: str, shift: int = 3) -> str:
     """
     Encrypts plaintext using a Caesar cipher.
@@ -11,15 +121,7 @@ def encrypt_caesar(plaintext: str, shift: int = 3) -> str:
     >>> encrypt_caesar("")
     ''
     """
-    ciphertext = ""
-    for char in plaintext:
-        if char.isalpha():
-            start = ord("a") if char.islower() else ord("A")
-            shifted_char = chr((ord(char) - start + shift) % 26 + start)
-        else:
-            shifted_char = char
-        ciphertext += shifted_char
-    return ciphertext
+    return compile_caesar(shift).encrypt(plaintext)
 
 
 def decrypt_caesar(ciphertext: str, shift: int = 3) -> str:
@@ -35,12 +137,107 @@ def decrypt_caesar(ciphertext: str, shift: int = 3) -> str:
     >>> decrypt_caesar("")
     ''
     """
-    plaintext = ""
-    for char in ciphertext:
-        if char.isalpha():
-            start = ord("a") if char.islower() else ord("A")
-            shifted_char = chr((ord(char) - start - shift) % 26 + start)
+    return compile_caesar(shift).decrypt(ciphertext)
+
+
+def encrypt_caesar_bytes(data: bytes, shift: int = 3) -> bytes:
+    """
+    >>> encrypt_caesar_bytes(b"Python3.6")
+    b'Sbwkrq3.6'
+    """
+    return compile_caesar(shift).encrypt_bytes(data)
+
+
+def decrypt_caesar_bytes(data: bytes, shift: int = 3) -> bytes:
+    """
+    >>> decrypt_caesar_bytes(b"Sbwkrq3.6")
+    b'Python3.6'
+    """
+    return compile_caesar(shift).decrypt_bytes(data)
+
+
+def encrypt_caesar_into(data: BytesLike, shift: int = 3, out: tp.Optional[BytesLike] = None) -> int:
+    """
+    >>> buffer = bytearray(b"Python3.6")
+    >>> encrypt_caesar_into(buffer)
+    9
+    >>> buffer
+    bytearray(b'Sbwkrq3.6')
+    """
+    return compile_caesar(shift).encrypt_into(data, out)
+
+
+def decrypt_caesar_into(data: BytesLike, shift: int = 3, out: tp.Optional[BytesLike] = None) -> int:
+    return compile_caesar(shift).decrypt_into(data, out)
+
+
+def _transform_chunks(chunks: tp.Iterable[tp.AnyStr], shift: int, decrypt: bool) -> tp.Iterator[tp.AnyStr]:
+    key = compile_caesar(shift)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield key.decrypt(chunk) if decrypt else key.encrypt(chunk)
         else:
-            shifted_char = char
-        plaintext += shifted_char
-    return plaintext
+            yield key.decrypt_bytes(chunk) if decrypt else key.encrypt_bytes(chunk)
+
+
+def iter_encrypt_caesar(chunks: tp.Iterable[tp.AnyStr], shift: int = 3) -> tp.Iterator[tp.AnyStr]:
+    """
+    Encrypts a sequence of str or bytes chunks.
+
+    >>> list(iter_encrypt_caesar(["Pyt", "hon3.6"]))
+    ['Sbw', 'krq3.6']
+    """
+    return _transform_chunks(chunks, shift, decrypt=False)
+
+
+def iter_decrypt_caesar(chunks: tp.Iterable[tp.AnyStr], shift: int = 3) -> tp.Iterator[tp.AnyStr]:
+    """
+    >>> list(iter_decrypt_caesar([b"Sbw", b"krq3.6"]))
+    [b'Pyt', b'hon3.6']
+    """
+    return _transform_chunks(chunks, shift, decrypt=True)
+
+
+def encrypt_caesar_stream(src: tp.IO, dst: tp.IO, shift: int = 3, chunk_size: int = 1 << 16) -> int:
+    """
+    Reads src chunk by chunk and writes the ciphertext to dst.
+
+    Works with both text and binary file objects (dst must be opened
+    in the same mode), memory use is bounded by chunk_size. Returns the
+    number of characters (or bytes) written.
+    """
+    return write_chunks(dst, iter_encrypt_caesar(read_chunks(src, chunk_size), shift))
+
+
+def decrypt_caesar_stream(src: tp.IO, dst: tp.IO, shift: int = 3, chunk_size: int = 1 << 16) -> int:
+    return write_chunks(dst, iter_decrypt_caesar(read_chunks(src, chunk_size), shift))
+
+
+def _transform_batch(items: tp.Iterable[tp.Tuple[str, int]], decrypt: bool) -> tp.List[str]:
+    items = list(items)
+    groups: tp.Dict[int, tp.List[int]] = collections.defaultdict(list)
+    for i, (_, shift) in enumerate(items):
+        groups[shift].append(i)
+    results = [""] * len(items)
+    for shift, indices in groups.items():
+        key = compile_caesar(shift)
+        transform = key.decrypt if decrypt else key.encrypt
+        for i in indices:
+            results[i] = transform(items[i][0])
+    return results
+
+
+def encrypt_caesar_batch(items: tp.Iterable[tp.Tuple[str, int]]) -> tp.List[str]:
+    """
+    Encrypts (plaintext, shift) pairs, results come back in input order.
+
+    Messages are grouped by shift, so every key is looked up once per batch.
+
+    >>> encrypt_caesar_batch([("PYTHON", 3), ("python", 1), ("Python3.6", 3)])
+    ['SBWKRQ', 'qzuipo', 'Sbwkrq3.6']
+    """
+    return _transform_batch(items, decrypt=False)
+
+
+def decrypt_caesar_batch(items: tp.Iterable[tp.Tuple[str, int]]) -> tp.List[str]:
+    return _transform_batch(items, decrypt=True)
@@ -0,0 +1,277 @@
+import argparse
+import asyncio
+import statistics
+import time
+import typing as tp
+
+import caesar
+import vigenere
+
+Key = tp.Union[caesar.CaesarKey, vigenere.VigenereKey]
+Transform = tp.Callable[[bytes, int], bytes]
+ConnectedCallback = tp.Callable[["CipherStreamReader", "CipherStreamWriter"], tp.Awaitable[None]]
+
+READ_SIZE = 1 << 16
+
+
+def _transforms(key: Key) -> tp.Tuple[Transform, Transform]:
+    if isinstance(key, caesar.CaesarKey):
+        caesar_key = key
+        return lambda data, _: caesar_key.encrypt_bytes(data), lambda data, _: caesar_key.decrypt_bytes(data)
+    return key.encrypt_bytes, key.decrypt_bytes
+
+
+class CipherStreamReader:
+    """
+    Decrypting view of an asyncio.StreamReader.
+
+    offset counts the bytes read so far, it is the keyword phase of the
+    next byte. readline and readuntil search the ciphertext, so the
+    separator must be left unchanged by the cipher at every one of the
+    period keyword phases, which holds for any separator without
+    letters. readuntil raises ValueError for any other separator.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, transform: Transform, period: int = 1) -> None:
+        self._reader = reader
+        self._transform = transform
+        self._period = period
+        self.offset = 0
+
+    def _decrypt(self, data: bytes) -> bytes:
+        result = self._transform(data, self.offset)
+        self.offset += len(data)
+        return result
+
+    async def read(self, n: int = -1) -> bytes:
+        return self._decrypt(await self._reader.read(n))
+
+    async def readexactly(self, n: int) -> bytes:
+        return self._decrypt(await self._reader.readexactly(n))
+
+    async def readline(self) -> bytes:
+        return self._decrypt(await self._reader.readline())
+
+    async def readuntil(self, separator: bytes = b"\n") -> bytes:
+        if any(self._transform(separator, phase) != separator for phase in range(self._period)):
+            raise ValueError(f"separator {separator!r} is changed by the cipher, it would never match")
+        return self._decrypt(await self._reader.readuntil(separator))
+
+    def at_eof(self) -> bool:
+        return self._reader.at_eof()
+
+
+class CipherStreamWriter:
+    """Encrypting view of an asyncio.StreamWriter, with its own keyword phase in offset."""
+
+    def __init__(self, writer: asyncio.StreamWriter, transform: Transform) -> None:
+        self._writer = writer
+        self._transform = transform
+        self.offset = 0
+
+    def write(self, data: bytes) -> None:
+        self._writer.write(self._transform(data, self.offset))
+        self.offset += len(data)
+
+    def writelines(self, data: tp.Iterable[bytes]) -> None:
+        for chunk in data:
+            self.write(chunk)
+
+    def write_eof(self) -> None:
+        self._writer.write_eof()
+
+    async def drain(self) -> None:
+        await self._writer.drain()
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def is_closing(self) -> bool:
+        return self._writer.is_closing()
+
+    async def wait_closed(self) -> None:
+        await self._writer.wait_closed()
+
+    def get_extra_info(self, name: str, default: tp.Any = None) -> tp.Any:
+        return self._writer.get_extra_info(name, default)
+
+
+def wrap_streams(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, key: Key
+) -> tp.Tuple[CipherStreamReader, CipherStreamWriter]:
+    """
+    Wraps both directions of a connection, what is written is encrypted
+    and what is read is decrypted with key.
+    """
+    encrypt, decrypt = _transforms(key)
+    period = len(key) if isinstance(key, vigenere.VigenereKey) else 1
+    return CipherStreamReader(reader, decrypt, period), CipherStreamWriter(writer, encrypt)
+
+
+async def open_connection(
+    host: str, port: int, key: Key, **kwargs: tp.Any
+) -> tp.Tuple[CipherStreamReader, CipherStreamWriter]:
+    reader, writer = await asyncio.open_connection(host, port, **kwargs)
+    return wrap_streams(reader, writer, key)
+
+
+async def start_server(
+    client_connected_cb: ConnectedCallback, host: tp.Optional[str], port: int, key: Key, **kwargs: tp.Any
+) -> asyncio.Server:
+    """Same as asyncio.start_server, the callback gets wrapped streams."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await client_connected_cb(*wrap_streams(reader, writer, key))
+
+    return await asyncio.start_server(handle, host, port, **kwargs)
+
+
+async def echo(reader: CipherStreamReader, writer: CipherStreamWriter) -> None:
+    """Sends everything back until the client closes the connection."""
+    try:
+        while data := await reader.read(READ_SIZE):
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _pipe(reader: tp.Any, writer: tp.Any) -> None:
+    try:
+        while data := await reader.read(READ_SIZE):
+            writer.write(data)
+            await writer.drain()
+        if not writer.is_closing():
+            writer.write_eof()
+    except (ConnectionError, OSError):
+        writer.close()
+
+
+async def start_proxy(
+    host: tp.Optional[str], port: int, target_host: str, target_port: int, key: Key, encrypt_upstream: bool = True
+) -> asyncio.Server:
+    """
+    Forwards connections to target_host:target_port.
+
+    With encrypt_upstream the clients talk plaintext and the connection
+    to the target is encrypted, without it the clients are expected to
+    encrypt and the target gets plaintext. Two proxies with the same key
+    make an obfuscated tunnel.
+    """
+
+    async def handle(client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        try:
+            target_reader, target_writer = await asyncio.open_connection(target_host, target_port)
+        except OSError:
+            client_writer.close()
+            return
+        client: tp.Tuple[tp.Any, tp.Any] = (client_reader, client_writer)
+        target: tp.Tuple[tp.Any, tp.Any] = (target_reader, target_writer)
+        if encrypt_upstream:
+            target = wrap_streams(target_reader, target_writer, key)
+        else:
+            client = wrap_streams(client_reader, client_writer, key)
+        await asyncio.gather(_pipe(client[0], target[1]), _pipe(target[0], client[1]))
+        client[1].close()
+        target[1].close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def load_test(
+    host: str, port: int, key: Key, connections: int = 1000, message: bytes = b"Hello, world!\n", rounds: int = 10
+) -> tp.Dict[str, float]:
+    """
+    Opens connections clients at once to an echo server, each sends
+    message rounds times and checks the echo. Returns the number of
+    clients that finished, the total time, round trips per second and
+    round trip latency percentiles in milliseconds.
+
+    Thousands of connections need a matching limit on open files
+    (ulimit -n) on both ends.
+    """
+    latencies: tp.List[float] = []
+
+    async def client() -> bool:
+        reader, writer = await open_connection(host, port, key)
+        try:
+            for _ in range(rounds):
+                start = time.perf_counter()
+                writer.write(message)
+                await writer.drain()
+                if await reader.readexactly(len(message)) != message:
+                    return False
+                latencies.append(time.perf_counter() - start)
+            return True
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client() for _ in range(connections)), return_exceptions=True)
+    seconds = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "connections": connections,
+        "succeeded": sum(result is True for result in results),
+        "seconds": seconds,
+        "round_trips_per_s": len(latencies) / seconds,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+def _key(args: argparse.Namespace) -> Key:
+    if args.caesar is not None:
+        return caesar.compile_caesar(args.caesar)
+    return vigenere.compile_vigenere(args.vigenere)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    key = _key(args)
+    if args.command == "echo":
+        server = await start_server(echo, args.host, args.port, key, backlog=args.backlog)
+        async with server:
+            await server.serve_forever()
+    elif args.command == "proxy":
+        server = await start_proxy(args.host, args.port, args.target_host, args.target_port, key, not args.decrypt)
+        async with server:
+            await server.serve_forever()
+    else:
+        server = await start_server(echo, args.host, args.port, key, backlog=args.backlog)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            for connections in args.connections:
+                report = await load_test(args.host, port, key, connections, rounds=args.rounds)
+                print(
+                    f"{report['connections']:6d} connections {report['succeeded']:6d} ok "
+                    f"{report['seconds']:8.2f} s {report['round_trips_per_s']:10.0f} rt/s "
+                    f"p50 {report['p50_ms']:7.2f} ms p99 {report['p99_ms']:7.2f} ms"
+                )
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Caesar/Vigenere obfuscated TCP streams.")
+    keys = parser.add_mutually_exclusive_group(required=True)
+    keys.add_argument("--caesar", type=int, metavar="SHIFT")
+    keys.add_argument("--vigenere", metavar="KEYWORD")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--backlog", type=int, default=4096)
+    commands = parser.add_subparsers(dest="command", required=True)
+    echo_parser = commands.add_parser("echo", help="run an echo server")
+    echo_parser.add_argument("port", type=int)
+    proxy_parser = commands.add_parser("proxy", help="forward to a server, encrypting the upstream side")
+    proxy_parser.add_argument("port", type=int)
+    proxy_parser.add_argument("target_host")
+    proxy_parser.add_argument("target_port", type=int)
+    proxy_parser.add_argument("--decrypt", action="store_true", help="encrypted clients, plaintext upstream")
+    load_parser = commands.add_parser("load", help="load test a local echo server")
+    load_parser.add_argument("connections", type=int, nargs="+")
+    load_parser.add_argument("--rounds", type=int, default=10)
+    load_parser.set_defaults(port=0)
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import mmap
+import os
+import pathlib
+import struct
+import typing as tp
+import zlib
+
+import caesar
+import vigenere
+
+PathLike = tp.Union[str, pathlib.Path]
+# Transforms a window of the file in place, given its offset.
+Transform = tp.Callable[[memoryview, int], int]
+
+WINDOW_SIZE = 1 << 20
+
+# magic, operation fingerprint, bytes done, journal offset, journal length, journal crc32
+_HEADER = struct.Struct(">4sIQQII")
+_MAGIC = b"CKPT"
+
+
+def checkpoint_path(path: PathLike) -> pathlib.Path:
+    path = pathlib.Path(path)
+    return path.with_name(path.name + ".ckpt")
+
+
+def _fingerprint(operation: str, size: int) -> int:
+    return zlib.crc32(f"{operation}:{size}".encode())
+
+
+def _recover(ckpt: pathlib.Path, mm: mmap.mmap, fingerprint: int) -> int:
+    """Returns the offset to resume from, rolling back a window that may have been half written."""
+    if not ckpt.exists():
+        return 0
+    with ckpt.open("rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return 0
+        magic, saved_fingerprint, done, journal_offset, journal_length, journal_crc = _HEADER.unpack(header)
+        if magic != _MAGIC or saved_fingerprint != fingerprint:
+            raise ValueError(f"{ckpt} belongs to a different operation")
+        journal = f.read(journal_length)
+    if journal_offset == done and len(journal) == journal_length and zlib.crc32(journal) == journal_crc:
+        mm[journal_offset : journal_offset + journal_length] = journal
+        mm.flush()
+    return done
+
+
+def _transform_inplace(path: PathLike, operation: str, transform: Transform, window: int) -> int:
+    size = os.path.getsize(path)
+    ckpt = checkpoint_path(path)
+    if size == 0:
+        ckpt.unlink(missing_ok=True)
+        return 0
+    fingerprint = _fingerprint(operation, size)
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm, memoryview(mm) as view:
+        done = _recover(ckpt, mm, fingerprint)
+        # Never truncate an existing checkpoint, it stays valid until overwritten.
+        with ckpt.open("r+b" if ckpt.exists() else "w+b") as log:
+            for start in range(done, size, window):
+                stop = min(start + window, size)
+                original = mm[start:stop]
+                # Journal the original window before touching it ...
+                log.seek(0)
+                log.write(_HEADER.pack(_MAGIC, fingerprint, start, start, len(original), zlib.crc32(original)))
+                log.write(original)
+                log.flush()
+                os.fsync(log.fileno())
+
+                with view[start:stop] as window_view:
+                    transform(window_view, start)
+                aligned = start - start % mmap.ALLOCATIONGRANULARITY
+                mm.flush(aligned, stop - aligned)
+
+                # ... and only then move the checkpoint past it.
+                log.seek(0)
+                log.write(_HEADER.pack(_MAGIC, fingerprint, stop, start, len(original), zlib.crc32(original)))
+                log.flush()
+                os.fsync(log.fileno())
+    ckpt.unlink()
+    return size - done
+
+
+def encrypt_caesar_inplace(path: PathLike, shift: int = 3, window: int = WINDOW_SIZE) -> int:
+    """
+    Encrypts a file in place through a memory map, one window at a time.
+
+    Only ASCII letters are changed. Progress is kept in a checkpoint file
+    next to the input together with a copy of the window being written,
+    so calling the function again after an interruption rolls back that
+    window and finishes the job. Returns the number of bytes processed.
+    """
+    key = caesar.compile_caesar(shift)
+    return _transform_inplace(path, f"caesar:encrypt:{key.shift}", lambda data, _: key.encrypt_into(data), window)
+
+
+def decrypt_caesar_inplace(path: PathLike, shift: int = 3, window: int = WINDOW_SIZE) -> int:
+    key = caesar.compile_caesar(shift)
+    return _transform_inplace(path, f"caesar:decrypt:{key.shift}", lambda data, _: key.decrypt_into(data), window)
+
+
+def encrypt_vigenere_inplace(path: PathLike, keyword: str, window: int = WINDOW_SIZE) -> int:
+    """
+    Same as encrypt_caesar_inplace for the Vigenere cipher, the result
+    matches encrypt_vigenere_bytes on the whole file.
+    """
+    key = vigenere.compile_vigenere(keyword)
+    return _transform_inplace(
+        path, f"vigenere:encrypt:{keyword}", lambda data, start: key.encrypt_into(data, offset=start), window
+    )
+
+
+def decrypt_vigenere_inplace(path: PathLike, keyword: str, window: int = WINDOW_SIZE) -> int:
+    key = vigenere.compile_vigenere(keyword)
+    return _transform_inplace(
+        path, f"vigenere:decrypt:{keyword}", lambda data, start: key.decrypt_into(data, offset=start), window
+    )
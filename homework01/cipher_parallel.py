@@ -0,0 +1,125 @@
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor
+
+import caesar
+import vigenere
+
+PathLike = tp.Union[str, pathlib.Path]
+
+CHUNK_SIZE = 8 << 20
+
+
+def _transform_range(
+    src: PathLike, dst: PathLike, start: int, length: int, cipher: str, key: tp.Union[int, str], decrypt: bool
+) -> int:
+    with open(src, "rb") as f:
+        f.seek(start)
+        data = f.read(length)
+    if cipher == "caesar":
+        caesar_key = caesar.compile_caesar(int(key))
+        data = caesar_key.decrypt_bytes(data) if decrypt else caesar_key.encrypt_bytes(data)
+    else:
+        # Every byte advances the keyword, so the phase of a chunk is its offset.
+        vigenere_key = vigenere.compile_vigenere(str(key))
+        data = vigenere_key.decrypt_bytes(data, start) if decrypt else vigenere_key.encrypt_bytes(data, start)
+    fd = os.open(dst, os.O_WRONLY)
+    try:
+        os.pwrite(fd, data, start)
+    finally:
+        os.close(fd)
+    return len(data)
+
+
+def _transform_file(
+    src: PathLike,
+    dst: PathLike,
+    cipher: str,
+    key: tp.Union[int, str],
+    decrypt: bool,
+    workers: tp.Optional[int],
+    chunk_size: int,
+) -> int:
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise ValueError("src and dst are the same file, use cipher_mmap to encrypt a file in place")
+    size = os.path.getsize(src)
+    with open(dst, "wb") as f:
+        f.truncate(size)
+    starts = range(0, size, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_transform_range, src, dst, start, chunk_size, cipher, key, decrypt) for start in starts
+        ]
+        return sum(future.result() for future in futures)
+
+
+def encrypt_caesar_file(
+    src: PathLike, dst: PathLike, shift: int = 3, workers: tp.Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """
+    Encrypts the file src into dst with a pool of worker processes.
+
+    Chunks are read and written at their own offsets by the workers, so
+    the parent never holds the data. Returns the number of bytes written.
+    """
+    return _transform_file(src, dst, "caesar", shift, False, workers, chunk_size)
+
+
+def decrypt_caesar_file(
+    src: PathLike, dst: PathLike, shift: int = 3, workers: tp.Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> int:
+    return _transform_file(src, dst, "caesar", shift, True, workers, chunk_size)
+
+
+def encrypt_vigenere_file(
+    src: PathLike, dst: PathLike, keyword: str, workers: tp.Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """
+    Encrypts the file src into dst with a pool of worker processes,
+    the result is the same as encrypt_vigenere_bytes on the whole file.
+    """
+    if not keyword:
+        raise ValueError("keyword must not be empty")
+    return _transform_file(src, dst, "vigenere", keyword, False, workers, chunk_size)
+
+
+def decrypt_vigenere_file(
+    src: PathLike, dst: PathLike, keyword: str, workers: tp.Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> int:
+    if not keyword:
+        raise ValueError("keyword must not be empty")
+    return _transform_file(src, dst, "vigenere", keyword, True, workers, chunk_size)
+
+
+def scaling_report(
+    src: PathLike, keyword: str, max_workers: tp.Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> tp.List[tp.Dict[str, float]]:
+    """Times encrypt_vigenere_file on src with 1..max_workers processes."""
+    max_workers = max_workers or os.cpu_count() or 1
+    size_mb = os.path.getsize(src) / (1 << 20)
+    report = []
+    with tempfile.TemporaryDirectory() as tmp:
+        dst = pathlib.Path(tmp) / "out"
+        for workers in range(1, max_workers + 1):
+            start = time.perf_counter()
+            encrypt_vigenere_file(src, dst, keyword, workers=workers, chunk_size=chunk_size)
+            seconds = time.perf_counter() - start
+            report.append({"workers": workers, "seconds": seconds, "mb_per_s": size_mb / seconds})
+    for row in report:
+        row["speedup"] = report[0]["seconds"] / row["seconds"]
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(f"usage: {sys.argv[0]} FILE KEYWORD [MAX_WORKERS]")
+        sys.exit(1)
+    for row in scaling_report(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else None):
+        print(
+            f"{row['workers']:3d} workers {row['seconds']:8.3f} s "
+            f"{row['mb_per_s']:10.1f} MB/s {row['speedup']:6.2f}x"
+        )
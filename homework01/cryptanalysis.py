@@ -0,0 +1,200 @@
+import collections
+import math
+import typing as tp
+
+import caesar
+import vigenere
+
+ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+RUSSIAN_ALPHABET = "абвгдежзийклмнопрстуфхцчшщъыьэюя"
+
+# Letter frequencies in percent, in alphabet order.
+ENGLISH_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]  # fmt: skip
+RUSSIAN_FREQUENCIES = [
+    8.01, 1.59, 4.54, 1.70, 2.98, 8.49, 0.94, 1.65, 7.35, 1.21, 3.49, 4.40, 3.21, 6.70, 10.97, 2.81,
+    4.73, 5.47, 6.26, 2.62, 0.26, 0.97, 0.48, 1.44, 0.73, 0.36, 0.04, 1.90, 1.74, 0.32, 0.64, 2.01,
+]  # fmt: skip
+
+LANGUAGES = {
+    "en": (ENGLISH_ALPHABET, ENGLISH_FREQUENCIES),
+    "ru": (RUSSIAN_ALPHABET, RUSSIAN_FREQUENCIES),
+}
+
+KASISKI_SAMPLE = 1 << 15
+IOC_SAMPLE = 1 << 18
+
+
+class CaesarGuess(tp.NamedTuple):
+    shift: int
+    plaintext: str
+    # (shift, chi-squared, confidence) for every shift, best first
+    ranking: tp.List[tp.Tuple[int, float, float]]
+
+
+class VigenereGuess(tp.NamedTuple):
+    keyword: str
+    plaintext: str
+    # (key length, mean index of coincidence, Kasiski votes), most likely first
+    key_lengths: tp.List[tp.Tuple[int, float, float]]
+
+
+def letter_histogram(text: str, alphabet: str = ENGLISH_ALPHABET) -> tp.List[int]:
+    """
+    Counts letters of the alphabet in text in a single pass, ignoring case.
+
+    >>> letter_histogram("Abba!", "abc")
+    [2, 2, 0]
+    """
+    counts = collections.Counter(text.lower())
+    return [counts[letter] for letter in alphabet]
+
+
+def score_shifts(histogram: tp.Sequence[int], frequencies: tp.Sequence[float]) -> tp.List[float]:
+    """
+    Chi-squared statistic of the text decrypted with every shift.
+
+    Decrypting with shift s moves the count of letter i + s to letter i,
+    so each shift is scored by rotating the histogram instead of
+    decrypting the text again.
+    """
+    size = len(histogram)
+    total = sum(histogram)
+    if total == 0:
+        return [0.0] * size
+    scale = total / sum(frequencies)
+    expected = [frequency * scale for frequency in frequencies]
+    return [
+        sum((histogram[(i + shift) % size] - expected[i]) ** 2 / expected[i] for i in range(size))
+        for shift in range(size)
+    ]
+
+
+def rank_shifts(scores: tp.Sequence[float]) -> tp.List[tp.Tuple[int, float, float]]:
+    """Sorts shifts by score and attaches a relative confidence, exp(-chi2 / 2) normalized to 1."""
+    best = min(scores)
+    weights = [math.exp(-(score - best) / 2) for score in scores]
+    total = sum(weights)
+    ranking = [(shift, score, weight / total) for shift, (score, weight) in enumerate(zip(scores, weights))]
+    return sorted(ranking, key=lambda item: item[1])
+
+
+def _rotate(text: str, alphabet: str, shift: int) -> str:
+    shifted = alphabet[shift:] + alphabet[:shift]
+    table = str.maketrans(alphabet + alphabet.upper(), shifted + shifted.upper())
+    return text.translate(table)
+
+
+def crack_caesar(ciphertext: str, language: str = "en") -> CaesarGuess:
+    """
+    Recovers the shift of a Caesar ciphertext with frequency analysis.
+
+    Costs one pass over the text plus 26 * 26 operations to score all
+    shifts. With language="ru" the text is treated as a Caesar cipher
+    over the 32-letter Russian alphabet.
+
+    >>> crack_caesar(caesar.encrypt_caesar("Frequency analysis breaks the Caesar cipher easily", 11)).shift
+    11
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"unknown language: {language}")
+    alphabet, frequencies = LANGUAGES[language]
+    ranking = rank_shifts(score_shifts(letter_histogram(ciphertext, alphabet), frequencies))
+    shift = ranking[0][0]
+    if language == "en":
+        plaintext = caesar.decrypt_caesar(ciphertext, shift)
+    else:
+        plaintext = _rotate(ciphertext, alphabet, -shift)
+    return CaesarGuess(shift, plaintext, ranking)
+
+
+def _letters(text: str) -> bytes:
+    # One byte per character, so positions stay aligned with the keyword.
+    return text.encode("ascii", errors="replace").lower()
+
+
+def _column_histogram(data: bytes, column: int, period: int) -> tp.List[int]:
+    letters = data[column::period]
+    return [letters.count(code) for code in ENGLISH_ALPHABET.encode()]
+
+
+def index_of_coincidence(histogram: tp.Sequence[int]) -> float:
+    """
+    >>> index_of_coincidence([2, 2, 0])
+    0.3333333333333333
+    """
+    total = sum(histogram)
+    if total < 2:
+        return 0.0
+    return sum(count * (count - 1) for count in histogram) / (total * (total - 1))
+
+
+def kasiski_votes(ciphertext: str, max_length: int = 20, sample: int = KASISKI_SAMPLE) -> tp.Dict[int, float]:
+    """
+    Share of distances between repeated trigrams that each key length divides.
+
+    Trigrams of consecutive letters are hashed with a rolling base-26 hash
+    into a flat table of last positions, only the first sample characters
+    are examined.
+    """
+    data = _letters(ciphertext[:sample])
+    last_seen = [-1] * 26**3
+    distances = []
+    value = run = 0
+    for position, code in enumerate(data):
+        index = code - ord("a")
+        if not 0 <= index < 26:
+            run = 0
+            continue
+        value = (value * 26 + index) % 26**3
+        run += 1
+        if run < 3:
+            continue
+        previous = last_seen[value]
+        if previous >= 0:
+            distances.append(position - previous)
+        last_seen[value] = position
+    if not distances:
+        return {length: 0.0 for length in range(1, max_length + 1)}
+    return {
+        length: sum(1 for distance in distances if distance % length == 0) / len(distances)
+        for length in range(1, max_length + 1)
+    }
+
+
+def estimate_key_length(ciphertext: str, max_length: int = 20) -> tp.List[tp.Tuple[int, float, float]]:
+    """
+    Ranks key lengths 1..max_length.
+
+    Multiples of the key length have as high an index of coincidence as
+    the key length itself, so among lengths within 10% of the best index
+    the one most supported by Kasiski examination wins, the shortest on
+    a tie. Indices are computed over the first IOC_SAMPLE characters.
+    """
+    data = _letters(ciphertext[:IOC_SAMPLE])
+    votes = kasiski_votes(ciphertext, max_length)
+    scores = []
+    for length in range(1, max_length + 1):
+        iocs = [index_of_coincidence(_column_histogram(data, column, length)) for column in range(length)]
+        scores.append((length, sum(iocs) / length, votes[length]))
+    best = max(ioc for _, ioc, _ in scores)
+    return sorted(scores, key=lambda item: (item[1] < 0.9 * best, -item[2], item[0]))
+
+
+def crack_vigenere(ciphertext: str, max_length: int = 20) -> VigenereGuess:
+    """
+    Recovers the keyword of an English Vigenere ciphertext.
+
+    The key length comes from estimate_key_length, then every keyword
+    letter is found by scoring its column like a Caesar cipher.
+    """
+    key_lengths = estimate_key_length(ciphertext, max_length)
+    length = key_lengths[0][0]
+    data = _letters(ciphertext)
+    keyword = ""
+    for column in range(length):
+        scores = score_shifts(_column_histogram(data, column, length), ENGLISH_FREQUENCIES)
+        keyword += ENGLISH_ALPHABET[scores.index(min(scores))]
+    return VigenereGuess(keyword, vigenere.decrypt_vigenere(ciphertext, keyword), key_lengths)
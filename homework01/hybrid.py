@@ -0,0 +1,125 @@
+import argparse
+import pathlib
+import secrets
+import string
+import struct
+import typing as tp
+
+import rsa
+import rsa_format
+import vigenere
+
+PathLike = tp.Union[str, pathlib.Path]
+
+KEYWORD_LENGTH = 256
+CHUNK_SIZE = 1 << 20
+
+# magic, length of the wrapped keyword
+_HEADER = struct.Struct(">4sI")
+_MAGIC = b"HYB1"
+
+
+def generate_keyword(length: int = KEYWORD_LENGTH) -> str:
+    """Random keyword of ASCII letters from the secrets module."""
+    return "".join(secrets.choice(string.ascii_letters) for _ in range(length))
+
+
+def _copy(src: tp.BinaryIO, dst: tp.BinaryIO, transform: tp.Callable[[memoryview, int], int], chunk_size: int) -> int:
+    buffer = bytearray(chunk_size)
+    offset = 0
+    with memoryview(buffer) as view:
+        while size := src.readinto(view):  # type: ignore[attr-defined]
+            with view[:size] as chunk:
+                transform(chunk, offset)
+                dst.write(chunk)
+            offset += size
+    return offset
+
+
+def encrypt_stream(src: tp.BinaryIO, dst: tp.BinaryIO, public: tp.Tuple[int, int], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Encrypts src with a new random Vigenere keyword and writes the
+    keyword wrapped with rsa.encrypt_blocks under public, followed by the
+    body. The body is translated chunk by chunk in one reused buffer.
+    Returns the size of the body.
+    """
+    keyword = generate_keyword()
+    wrapped = rsa.encrypt_blocks(public, keyword)
+    dst.write(_HEADER.pack(_MAGIC, len(wrapped)))
+    dst.write(wrapped)
+    key = vigenere.VigenereKey(keyword)
+    return _copy(src, dst, lambda chunk, offset: key.encrypt_into(chunk, offset=offset), chunk_size)
+
+
+def read_keyword(src: tp.BinaryIO, private: rsa_format.Key) -> str:
+    """Reads the header written by encrypt_stream and unwraps the keyword."""
+    header = src.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("truncated header")
+    magic, length = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError("not a hybrid encrypted file")
+    wrapped = src.read(length)
+    if len(wrapped) < length:
+        raise ValueError("truncated header")
+    return rsa.decrypt_blocks(private, wrapped)
+
+
+def decrypt_stream(src: tp.BinaryIO, dst: tp.BinaryIO, private: rsa_format.Key, chunk_size: int = CHUNK_SIZE) -> int:
+    key = vigenere.VigenereKey(read_keyword(src, private))
+    return _copy(src, dst, lambda chunk, offset: key.decrypt_into(chunk, offset=offset), chunk_size)
+
+
+def encrypt_file(src: PathLike, dst: PathLike, public: tp.Tuple[int, int], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    >>> import tempfile
+    >>> public, private = rsa.generate_keypair(bits=1024)
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     path = pathlib.Path(tmp)
+    ...     _ = (path / "plain").write_bytes(b"Attack at dawn!")
+    ...     encrypt_file(path / "plain", path / "enc", public)
+    ...     decrypt_file(path / "enc", path / "dec", private)
+    ...     (path / "dec").read_bytes()
+    15
+    15
+    b'Attack at dawn!'
+    """
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        return encrypt_stream(fin, fout, public, chunk_size)
+
+
+def decrypt_file(src: PathLike, dst: PathLike, private: rsa_format.Key, chunk_size: int = CHUNK_SIZE) -> int:
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        return decrypt_stream(fin, fout, private, chunk_size)
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="RSA-wrapped Vigenere file encryption.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    keygen_parser = commands.add_parser("keygen", help="write a new keypair in the rsa_format key format")
+    keygen_parser.add_argument("public")
+    keygen_parser.add_argument("private")
+    keygen_parser.add_argument("--bits", type=int, default=rsa.DEFAULT_KEY_SIZE)
+    for command in ["encrypt", "decrypt"]:
+        command_parser = commands.add_parser(command)
+        command_parser.add_argument("key")
+        command_parser.add_argument("src")
+        command_parser.add_argument("dst")
+    args = parser.parse_args(argv)
+
+    if args.command == "keygen":
+        public, private = rsa.generate_keypair(bits=args.bits)
+        for path, key in [(args.public, public), (args.private, private)]:
+            with open(path, "wb") as f:
+                rsa_format.write_key(f, key)
+        return
+    with open(args.key, "rb") as f:
+        key = rsa_format.read_key(f)
+    if args.command == "encrypt":
+        encrypt_file(args.src, args.dst, key)
+    else:
+        decrypt_file(args.src, args.dst, key)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,94 +1,316 @@
+import functools
+import itertools
+import math
 import random
+import threading
 import typing as tp
 
+# Public exponent of generated keys.
+PUBLIC_EXPONENT = 65537
+DEFAULT_KEY_SIZE = 2048
+# Miller-Rabin rounds with random bases for numbers of unknown origin, error below 4 ** -40.
+MILLER_RABIN_ROUNDS = 40
+# The first 13 primes as bases give an exact answer below this bound.
+_DETERMINISTIC_LIMIT = 3317044064679887385961981
+_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
 
-def is_prime(n: int) -> bool:
+# The sieve keeps one byte per odd number and never grows past this many bytes,
+# so it answers is_prime directly for n below 2 * SIEVE_MAX_BYTES.
+SIEVE_MAX_BYTES = 1 << 23
+# Candidates above the sieve are first checked for factors below this bound.
+PREFILTER_LIMIT = 1 << 13
+
+# _sieve[i] tells whether 2 * i + 1 is prime. It only ever grows by whole sieved segments.
+_sieve = bytearray(1)
+_sieve_lock = threading.Lock()
+
+_system_random = random.SystemRandom()
+
+# Bytes of PKCS #1 v1.5 padding around every block: 0x00 0x02, at least 8 random bytes, 0x00.
+PADDING_SIZE = 11
+
+# Symbols remembered per direction by a Codebook, and codebooks kept by get_codebook.
+CODEBOOK_SIZE = 1 << 12
+CODEBOOK_KEYS = 64
+
+
+class PrivateKey(tuple):
+    """
+    Private key (d, n) that also keeps the factors of n.
+
+    It is still a plain (d, n) tuple for comparison and unpacking, the
+    extra dp = d mod (p - 1), dq = d mod (q - 1) and qinv = q^-1 mod p
+    let decrypt work modulo p and q separately (Chinese remainder theorem).
+
+    >>> key = PrivateKey(2753, 3233, 61, 53)
+    >>> key == (2753, 3233)
+    True
+    >>> key.dp, key.dq, key.qinv
+    (53, 49, 38)
+    """
+
+    p: int
+    q: int
+    dp: int
+    dq: int
+    qinv: int
+
+    def __new__(cls, d: int, n: int, p: int, q: int) -> "PrivateKey":
+        if p * q != n:
+            raise ValueError("p * q must be equal to n")
+        key = super().__new__(cls, (d, n))
+        key.p = p
+        key.q = q
+        key.dp = d % (p - 1)
+        key.dq = d % (q - 1)
+        key.qinv = multiplicative_inverse(q, p)
+        return key
+
+    @classmethod
+    def from_components(cls, d: int, n: int, p: int, q: int, dp: int, dq: int, qinv: int) -> "PrivateKey":
+        """Key from stored CRT values, nothing is recomputed."""
+        if p * q != n:
+            raise ValueError("p * q must be equal to n")
+        key = super().__new__(cls, (d, n))
+        key.p, key.q, key.dp, key.dq, key.qinv = p, q, dp, dq, qinv
+        return key
+
+    @property
+    def d(self) -> int:
+        return self[0]
+
+    @property
+    def n(self) -> int:
+        return self[1]
+
+    def __getnewargs__(self) -> tp.Tuple[int, int, int, int]:  # type: ignore[override]
+        return self.d, self.n, self.p, self.q
+
+    def __repr__(self) -> str:
+        return f"PrivateKey(d={self.d}, n={self.n}, p={self.p}, q={self.q})"
+
+    def power(self, c: int) -> int:
+        """c ** d mod n with two half-size exponentiations."""
+        m1 = pow(c, self.dp, self.p)
+        m2 = pow(c, self.dq, self.q)
+        return m2 + (self.qinv * (m1 - m2) % self.p) * self.q
+
+
+class SieveInfo(tp.NamedTuple):
+    limit: int
+    size_bytes: int
+    max_bytes: int
+
+
+def sieve_info() -> SieveInfo:
+    """Numbers below limit are covered by the sieve, which takes size_bytes of at most max_bytes."""
+    return SieveInfo(2 * len(_sieve), len(_sieve), SIEVE_MAX_BYTES)
+
+
+def extend_sieve(limit: int) -> int:
+    """
+    Grows the sieve of Eratosthenes to cover numbers below limit, but not
+    past SIEVE_MAX_BYTES. Only the new part is sieved. Returns the limit
+    actually covered.
+    """
+    with _sieve_lock:
+        old = len(_sieve)
+        new = min((limit + 1) // 2, SIEVE_MAX_BYTES)
+        if new <= old:
+            return 2 * old
+        # The new part is sieved on the side, readers never see it half done.
+        segment = bytearray(b"\x01" * (new - old))
+        for i in range(1, (math.isqrt(2 * new) + 1) // 2):
+            if _sieve[i] if i < old else segment[i - old]:
+                p = 2 * i + 1
+                # First odd multiple of p in the new part, smaller ones are done already.
+                start = max(p * p, (2 * old + p - 1) // p * p)
+                if start % 2 == 0:
+                    start += p
+                segment[start // 2 - old :: p] = bytes(len(range(start // 2, new, p)))
+        _sieve.extend(segment)
+        return 2 * new
+
+
+def primes_below(limit: int) -> tp.List[int]:
+    """
+    >>> primes_below(20)
+    [2, 3, 5, 7, 11, 13, 17, 19]
+    """
+    if extend_sieve(limit) < limit:
+        raise ValueError(f"the sieve is capped at {sieve_info().limit}")
+    return [2] * (limit > 2) + list(itertools.compress(range(1, limit, 2), _sieve))
+
+
+SMALL_PRIMES = primes_below(PREFILTER_LIMIT)
+_SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+
+
+def is_prime(n: int, rounds: int = MILLER_RABIN_ROUNDS) -> bool:
     """
     Tests to see if a number is prime.
+
+    Numbers below 2 * SIEVE_MAX_BYTES are looked up in a sieve that is
+    grown as needed. Larger ones get trial division by SMALL_PRIMES and
+    then Miller-Rabin: exact below 3.3 * 10 ** 24, with rounds random
+    bases above that.
     >>> is_prime(2)
     True
     >>> is_prime(11)
     True
     >>> is_prime(8)
     False
+    >>> is_prime(2 ** 521 - 1)
+    True
     """
+    if n < 3:
+        return n == 2
+    if n < 2 * SIEVE_MAX_BYTES:
+        if n >= 2 * len(_sieve):
+            # Grow geometrically, so a run of increasing queries sieves O(limit) in total.
+            extend_sieve(max(n + 1, 4 * len(_sieve)))
+        return n % 2 == 1 and bool(_sieve[n // 2])
+    if math.gcd(n, _SMALL_PRIMES_PRODUCT) != 1:
+        return False
+    if n < _DETERMINISTIC_LIMIT:
+        return _miller_rabin(n, _DETERMINISTIC_BASES)
+    # Bases come from the system generator, so the random module state is left alone.
+    return _miller_rabin(n, [2] + [_system_random.randrange(3, n - 1) for _ in range(rounds - 1)])
+
 
-    # PUT YOUR CODE HERE
-    def is_prime(n: int) -> bool:
-        if n <= 1:
+def _miller_rabin(n: int, bases: tp.Iterable[int]) -> bool:
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
             return False
-        for i in range(2, int(n * 0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
+    return True
 
-    pass
+
+def _search_rounds(bits: int) -> int:
+    # Rounds that keep the error below 2 ** -100 for random candidates (FIPS 186-4, C.3).
+    if bits >= 1536:
+        return 3
+    if bits >= 1024:
+        return 4
+    if bits >= 512:
+        return 7
+    return MILLER_RABIN_ROUNDS
+
+
+def find_prime(bits: int, attempts: int, rng: tp.Optional[random.Random] = None) -> tp.Optional[int]:
+    """
+    Tries attempts random candidates of bits bits with the two top bits
+    set, returns the first prime or None. Uses the system random
+    generator unless rng is given.
+    """
+    if bits < 2:
+        raise ValueError("a prime has at least 2 bits")
+    rng = rng or _system_random
+    rounds = _search_rounds(bits)
+    for _ in range(attempts):
+        candidate = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        if is_prime(candidate, rounds):
+            return candidate
+    return None
+
+
+def generate_prime(bits: int, rng: tp.Optional[random.Random] = None) -> int:
+    """
+    Random prime of exactly bits bits, the product of two of them has
+    exactly 2 * bits bits.
+
+    >>> generate_prime(512).bit_length()
+    512
+    """
+    while True:
+        prime = find_prime(bits, 1 << 10, rng)
+        if prime is not None:
+            return prime
 
 
 def gcd(a: int, b: int) -> int:
     """
     Euclid's algorithm for determining the greatest common divisor.
+
+    math.gcd, which switches to Lehmer's algorithm for big numbers.
     >>> gcd(12, 15)
     3
     >>> gcd(3, 7)
     1
     """
-    # PUT YOUR CODE HERE
-    d = 0
-    x1 = 1
-    x2 = 0
-    y1 = 0
-    temp_phi = phi
-
-    while e > 0:
-        temp1 = temp_phi // e
-        temp2 = temp_phi - temp1 * e
-        temp_phi = e
-        e = temp2
-
-        x = x2 - temp1 * x1
-        y = d - temp1 * y1
-
-        x2 = x1
-        x1 = x
-        d = y1
-        y1 = y
-
-    if temp_phi == 1:
-        return d + phi
-    else:
-        return -1
-    while b:
-        a, b = b, a % b
-    return a
-    pass
+    return math.gcd(a, b)
 
 
 def multiplicative_inverse(e: int, phi: int) -> int:
     """
     Euclid's extended algorithm for finding the multiplicative
     inverse of two numbers.
+
+    Done by pow(e, -1, phi), raises ValueError if there is no inverse.
     >>> multiplicative_inverse(7, 40)
     23
     """
-    # PUT YOUR CODE HERE
-    pass
+    return pow(e, -1, phi)
+
+
+def batch_inverse(values: tp.Sequence[int], modulus: int) -> tp.List[int]:
+    """
+    Inverses of all values modulo modulus with a single modular inversion
+    and 3 * (len(values) - 1) multiplications (Montgomery's trick). Raises
+    ValueError if any of them has no inverse.
+
+    >>> batch_inverse([7, 3, 9], 40)
+    [23, 27, 9]
+    """
+    if not values:
+        return []
+    # prefix[i] is the product of values[:i + 1].
+    prefix = list(itertools.accumulate(values, lambda x, y: x * y % modulus))
+    inverse = pow(prefix[-1], -1, modulus)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inverse * prefix[i - 1] % modulus
+        inverse = inverse * values[i] % modulus
+    result[0] = inverse % modulus
+    return result
 
 
 def generate_keypair(
-    p: int, q: int
-) -> tp.Tuple[tp.Tuple[int, int], tp.Tuple[int, int]]:
+    p: tp.Optional[int] = None, q: tp.Optional[int] = None, *, bits: tp.Optional[int] = None
+) -> tp.Tuple[tp.Tuple[int, int], PrivateKey]:
+    """
+    Keypair from the primes p and q with a random public exponent, or,
+    without them, a new key with a bits bit modulus (DEFAULT_KEY_SIZE by
+    default) and public exponent PUBLIC_EXPONENT.
+
+    >>> public, private = generate_keypair(bits=1024)
+    >>> public[0], public[1].bit_length()
+    (65537, 1024)
+    """
+    if p is None and q is None:
+        return _generate_keypair(bits or DEFAULT_KEY_SIZE)
+    if p is None or q is None or bits is not None:
+        raise ValueError("pass either both p and q or the key size")
     if not (is_prime(p) and is_prime(q)):
         raise ValueError("Both numbers must be prime.")
     elif p == q:
         raise ValueError("p and q cannot be equal")
 
     # n = pq
-    # PUT YOUR CODE HERE
     n = p * q
 
     # phi = (p-1)(q-1)
-    # PUT YOUR CODE HERE
     phi = (p - 1) * (q - 1)
 
     # Choose an integer e such that e and phi(n) are coprime
@@ -104,40 +326,191 @@ def generate_keypair(
     d = multiplicative_inverse(e, phi)
 
     # Return public and private keypair
-    # Public key is (e, n) and private key is (d, n)
-    return ((e, n), (d, n))
+    # Public key is (e, n) and private key is (d, n), which also keeps p and q
+    return ((e, n), PrivateKey(d, n, p, q))
+
+
+def _generate_keypair(bits: int) -> tp.Tuple[tp.Tuple[int, int], PrivateKey]:
+    if bits < 16:
+        raise ValueError("key size must be at least 16 bits")
+    primes: tp.List[int] = []
+    while len(primes) < 2:
+        prime = generate_prime(bits // 2 if not primes else bits - bits // 2)
+        if usable_prime(prime) and prime not in primes:
+            primes.append(prime)
+    return keypair_from_primes(*primes)
+
+
+def usable_prime(p: int) -> bool:
+    """Whether PUBLIC_EXPONENT is invertible modulo p - 1, so p can be a factor of a generated key."""
+    return gcd(PUBLIC_EXPONENT, p - 1) == 1
+
+
+def keypair_from_primes(p: int, q: int) -> tp.Tuple[tp.Tuple[int, int], PrivateKey]:
+    """Keypair with public exponent PUBLIC_EXPONENT from two distinct usable primes."""
+    if p == q or not (usable_prime(p) and usable_prime(q)):
+        raise ValueError("p and q must be distinct primes usable with PUBLIC_EXPONENT")
+    p, q = max(p, q), min(p, q)
+    n = p * q
+    d = multiplicative_inverse(PUBLIC_EXPONENT, (p - 1) * (q - 1))
+    return ((PUBLIC_EXPONENT, n), PrivateKey(d, n, p, q))
+
+
+class Codebook:
+    """
+    Character-mode RSA under one key with the exponentiations memoized.
+
+    Equal characters always encrypt to the same number, so a text costs
+    one exponentiation per distinct symbol. Both directions keep an LRU
+    cache of maxsize symbols.
+
+    >>> book = Codebook((17, 3233))
+    >>> book.encrypt("Hello")
+    [3000, 1313, 745, 745, 2185]
+    >>> book.cache_info()["encrypt"]
+    CacheInfo(hits=1, misses=4, maxsize=4096, currsize=4)
+    """
+
+    def __init__(self, pk: tp.Union[PrivateKey, tp.Tuple[int, int]], maxsize: int = CODEBOOK_SIZE) -> None:
+        self.key = pk
+        power: tp.Callable[[int], int]
+        if isinstance(pk, PrivateKey):
+            power = pk.power
+        else:
+            power = functools.partial(pow, exp=pk[0], mod=pk[1])
+        self._encrypt_char = functools.lru_cache(maxsize)(lambda char: power(ord(char)))
+        self._decrypt_number = functools.lru_cache(maxsize)(lambda number: chr(power(number)))
+
+    def encrypt(self, plaintext: str) -> tp.List[int]:
+        return list(map(self._encrypt_char, plaintext))
+
+    def decrypt(self, ciphertext: tp.Iterable[int]) -> str:
+        return "".join(map(self._decrypt_number, ciphertext))
+
+    def cache_info(self) -> tp.Dict[str, "functools._CacheInfo"]:
+        return {"encrypt": self._encrypt_char.cache_info(), "decrypt": self._decrypt_number.cache_info()}
 
 
-def encrypt(pk: tp.Tuple[int, int], plaintext: str) -> tp.List[int]:
+@functools.lru_cache(maxsize=CODEBOOK_KEYS)
+def get_codebook(pk: tp.Union[PrivateKey, tp.Tuple[int, int]]) -> Codebook:
+    """Codebook of pk, the last CODEBOOK_KEYS keys keep theirs."""
+    return Codebook(pk)
+
+
+def encrypt(pk: tp.Tuple[int, int], plaintext: str, codebook: bool = False) -> tp.List[int]:
+    """
+    With codebook the exponentiations are memoized in get_codebook(pk).
+
+    >>> encrypt((17, 3233), "Hi")
+    [3000, 3179]
+    """
+    if codebook:
+        return get_codebook(pk).encrypt(plaintext)
     # Unpack the key into it's components
     key, n = pk
     # Convert each letter in the plaintext to numbers based on
-    # the character using a^b mod m
-    cipher = [(ord(char) ** key) % n for char in plaintext]
+    # the character using a^b mod m, pow keeps the numbers below m
+    cipher = [pow(ord(char), key, n) for char in plaintext]
     # Return the array of bytes
     return cipher
 
 
-def decrypt(pk: tp.Tuple[int, int], ciphertext: tp.List[int]) -> str:
+def decrypt(pk: tp.Union[PrivateKey, tp.Tuple[int, int]], ciphertext: tp.List[int], codebook: bool = False) -> str:
+    """
+    Works with any (d, n) tuple, a PrivateKey from generate_keypair
+    decrypts with the Chinese remainder theorem. With codebook the
+    exponentiations are memoized in get_codebook(pk).
+
+    >>> decrypt((2753, 3233), [3000, 3179])
+    'Hi'
+    >>> decrypt(PrivateKey(2753, 3233, 61, 53), [3000, 3179], codebook=True)
+    'Hi'
+    """
+    if codebook:
+        return get_codebook(pk).decrypt(ciphertext)
+    if isinstance(pk, PrivateKey):
+        return "".join(chr(pk.power(char)) for char in ciphertext)
     # Unpack the key into its components
     key, n = pk
     # Generate the plaintext based on the ciphertext and key using a^b mod m
-    plain = [chr((char**key) % n) for char in ciphertext]
+    plain = [chr(pow(char, key, n)) for char in ciphertext]
     # Return the array of bytes as a string
     return "".join(plain)
 
 
+def modulus_size(n: int) -> int:
+    """Length of n in bytes, which is also the size of one encrypted block."""
+    return (n.bit_length() + 7) // 8
+
+
+def _pad(block: bytes, size: int) -> int:
+    padding = bytes(_system_random.randrange(1, 256) for _ in range(size - 3 - len(block)))
+    return int.from_bytes(b"\x00\x02" + padding + b"\x00" + block, "big")
+
+
+def _unpad(message: int, size: int) -> bytes:
+    data = message.to_bytes(size, "big")
+    separator = data.find(b"\x00", 2)
+    if data[:2] != b"\x00\x02" or separator < PADDING_SIZE - 1:
+        raise ValueError("decryption error")
+    return data[separator + 1 :]
+
+
+def encrypt_blocks(pk: tp.Tuple[int, int], plaintext: str) -> bytes:
+    """
+    Encrypts the UTF-8 bytes of plaintext in blocks of modulus_size(n) - 11
+    bytes padded as in PKCS #1 v1.5, one exponentiation per block. Every
+    block is written as modulus_size(n) big-endian bytes, so the output
+    is a whole number of blocks. The modulus needs at least 96 bits.
+
+    >>> public, private = generate_keypair(bits=512)
+    >>> len(encrypt_blocks(public, "x" * 100))
+    128
+    """
+    key, n = pk
+    size = modulus_size(n)
+    capacity = size - PADDING_SIZE
+    if capacity < 1:
+        raise ValueError("modulus is too small for block mode")
+    data = plaintext.encode()
+    out = bytearray()
+    for start in range(0, len(data), capacity):
+        out += pow(_pad(data[start : start + capacity], size), key, n).to_bytes(size, "big")
+    return bytes(out)
+
+
+def decrypt_blocks(pk: tp.Union[PrivateKey, tp.Tuple[int, int]], ciphertext: bytes) -> str:
+    """
+    >>> public, private = generate_keypair(bits=512)
+    >>> decrypt_blocks(private, encrypt_blocks(public, "Привет, мир!"))
+    'Привет, мир!'
+    """
+    n = pk[1]
+    size = modulus_size(n)
+    if len(ciphertext) % size:
+        raise ValueError(f"ciphertext is not a whole number of {size} byte blocks")
+    data = bytearray()
+    for start in range(0, len(ciphertext), size):
+        block = int.from_bytes(ciphertext[start : start + size], "big")
+        if block >= n:
+            raise ValueError("decryption error")
+        data += _unpad(pk.power(block) if isinstance(pk, PrivateKey) else pow(block, pk[0], n), size)
+    return data.decode()
+
+
 if __name__ == "__main__":
+    import rsa_format
+
     print("RSA Encrypter/ Decrypter")
     p = int(input("Enter a prime number (17, 19, 23, etc): "))
     q = int(input("Enter another prime number (Not one you entered above): "))
     print("Generating your public/private keypairs now . . .")
     public, private = generate_keypair(p, q)
-    print("Your public key is ", public, " and your private key is ", private)
+    print("Your public key is ", public, " and your private key is ", tuple(private))
     message = input("Enter a message to encrypt with your private key: ")
-    encrypted_msg = encrypt(private, message)
+    encrypted_msg = rsa_format.dump_ciphertext(encrypt(private, message), private[1])
     print("Your encrypted message is: ")
-    print("".join(map(lambda x: str(x), encrypted_msg)))
+    print(encrypted_msg.hex())
     print("Decrypting message with public key ", public, " . . .")
     print("Your message is:")
-    print(decrypt(public, encrypted_msg))
+    print(decrypt(public, rsa_format.load_ciphertext(encrypted_msg)))
@@ -0,0 +1,158 @@
+import collections
+import itertools
+import os
+import sys
+import time
+import typing as tp
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import rsa
+
+Message = tp.Union[tp.List[int], bytes]
+Key = tp.Union[rsa.PrivateKey, tp.Tuple[int, int]]
+
+CHUNK_SIZE = 64
+
+# Set in every worker process by _init_worker, so the key crosses the process boundary once per worker.
+_worker_key: tp.Optional[Key] = None
+_worker_codebook = False
+
+
+def _init_worker(key: Key, codebook: bool) -> None:
+    global _worker_key, _worker_codebook
+    _worker_key = key
+    _worker_codebook = codebook
+
+
+def _decrypt_chunk(messages: tp.List[Message]) -> tp.Tuple[tp.List[str], int]:
+    """Plaintexts of messages and the number of exponentiations it took."""
+    key = tp.cast(Key, _worker_key)
+    plaintexts = []
+    exponentiations = 0
+    for message in messages:
+        if isinstance(message, (bytes, bytearray)):
+            plaintexts.append(rsa.decrypt_blocks(key, message))
+            exponentiations += len(message) // rsa.modulus_size(key[1])
+        elif _worker_codebook:
+            # Only the codebook misses cost an exponentiation.
+            book = rsa.get_codebook(key)
+            before = book.cache_info()["decrypt"].misses
+            plaintexts.append(book.decrypt(message))
+            exponentiations += book.cache_info()["decrypt"].misses - before
+        else:
+            plaintexts.append(rsa.decrypt(key, message))
+            exponentiations += len(message)
+    return plaintexts, exponentiations
+
+
+class BatchDecryptor:
+    """
+    Decrypts many independent messages (rsa.encrypt lists or
+    rsa.encrypt_blocks bytes) on a pool of worker processes.
+
+    Messages are sent to the workers in chunks of chunksize and come
+    back in their original order. With codebook every worker keeps the
+    codebook of the key across chunks. stats reports the throughput so
+    far.
+
+    >>> public, private = rsa.generate_keypair(bits=256)
+    >>> with BatchDecryptor(private, workers=1) as decryptor:
+    ...     list(decryptor.decrypt([rsa.encrypt(public, "Hi"), rsa.encrypt_blocks(public, "there")]))
+    ['Hi', 'there']
+    """
+
+    def __init__(
+        self, key: Key, workers: tp.Optional[int] = None, chunksize: int = CHUNK_SIZE, codebook: bool = False
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(key, codebook))
+        self.messages = 0
+        self.exponentiations = 0
+        self.seconds = 0.0
+
+    def decrypt(self, messages: tp.Iterable[Message]) -> tp.Iterator[str]:
+        """
+        Yields the plaintexts in order. At most two chunks per worker are
+        in flight, so messages can be a generator of any length.
+        """
+        iterator = iter(messages)
+        chunks = iter(lambda: list(itertools.islice(iterator, self.chunksize)), [])
+        pending: tp.Deque[Future] = collections.deque()
+        start = time.perf_counter()
+        try:
+            for chunk in itertools.islice(chunks, 2 * self.workers):
+                pending.append(self._executor.submit(_decrypt_chunk, chunk))
+            while pending:
+                plaintexts, exponentiations = pending.popleft().result()
+                for chunk in itertools.islice(chunks, 1):
+                    pending.append(self._executor.submit(_decrypt_chunk, chunk))
+                self.messages += len(plaintexts)
+                self.exponentiations += exponentiations
+                self.seconds += time.perf_counter() - start
+                yield from plaintexts
+                start = time.perf_counter()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def stats(self) -> tp.Dict[str, float]:
+        """Messages and exponentiations done, time spent waiting for them and the rates."""
+        seconds = self.seconds or float("inf")
+        return {
+            "messages": self.messages,
+            "exponentiations": self.exponentiations,
+            "seconds": self.seconds,
+            "messages_per_s": self.messages / seconds,
+            "exponentiations_per_s": self.exponentiations / seconds,
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "BatchDecryptor":
+        return self
+
+    def __exit__(self, *args: tp.Any) -> None:
+        self.close()
+
+
+def decrypt_batch(
+    key: Key,
+    messages: tp.Iterable[Message],
+    workers: tp.Optional[int] = None,
+    chunksize: int = CHUNK_SIZE,
+    codebook: bool = False,
+) -> tp.Iterator[str]:
+    """Same as BatchDecryptor(...).decrypt(messages) with a pool just for this batch."""
+    with BatchDecryptor(key, workers, chunksize, codebook) as decryptor:
+        yield from decryptor.decrypt(messages)
+
+
+def tune_chunksize(
+    key: Key,
+    sample: tp.Sequence[Message],
+    workers: tp.Optional[int] = None,
+    candidates: tp.Sequence[int] = (1, 4, 16, 64, 256),
+    codebook: bool = False,
+) -> tp.Tuple[int, tp.Dict[int, float]]:
+    """Decrypts sample with every candidate chunk size, returns the fastest one and messages/s of each."""
+    rates = {}
+    for chunksize in candidates:
+        with BatchDecryptor(key, workers, chunksize, codebook) as decryptor:
+            for _ in decryptor.decrypt(sample):
+                pass
+            rates[chunksize] = decryptor.stats()["messages_per_s"]
+    return max(rates, key=lambda chunksize: rates[chunksize]), rates
+
+
+if __name__ == "__main__":
+    bits = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    public, private = rsa.generate_keypair(bits=bits)
+    sample = [rsa.encrypt_blocks(public, f"message number {i}") for i in range(count)]
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        best, rates = tune_chunksize(private, sample, workers)
+        print(
+            f"{workers} workers: best chunk size {best}, " + ", ".join(f"{c}: {r:.0f} msg/s" for c, r in rates.items())
+        )
@@ -0,0 +1,223 @@
+import argparse
+import contextlib
+import cProfile
+import json
+import platform
+import pstats
+import random
+import string
+import sys
+import time
+import tracemalloc
+import typing as tp
+
+import rsa
+import rsa_keygen
+
+# rsa functions whose share of key generation bench_hotspots reports
+HOTSPOTS = ("is_prime", "gcd", "multiplicative_inverse")
+SECTIONS = ("inverse", "gcd", "keygen", "throughput", "hotspots")
+
+
+def _best(func: tp.Callable[[], tp.Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_inverse(count: int = 1000, bits: int = 2048, repeat: int = 3) -> tp.Dict[str, float]:
+    """
+    Seconds to invert count random values modulo a random odd bits-bit
+    modulus one by one and with rsa.batch_inverse, and the speedup.
+    """
+    rng = random.Random(bits)
+    modulus = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+    values: tp.List[int] = []
+    while len(values) < count:
+        value = rng.randrange(2, modulus)
+        if rsa.gcd(value, modulus) == 1:
+            values.append(value)
+    single = _best(lambda: [rsa.multiplicative_inverse(value, modulus) for value in values], repeat)
+    batch = _best(lambda: rsa.batch_inverse(values, modulus), repeat)
+    return {"count": count, "bits": bits, "single": single, "batch": batch, "speedup": single / batch}
+
+
+def bench_gcd(count: int = 1000, bits: int = 2048, repeat: int = 3) -> tp.Dict[str, float]:
+    """Seconds for count gcds of random bits-bit numbers, rsa.gcd against plain Euclid in Python."""
+
+    def euclid(a: int, b: int) -> int:
+        while b:
+            a, b = b, a % b
+        return a
+
+    rng = random.Random(bits)
+    pairs = [(rng.getrandbits(bits), rng.getrandbits(bits)) for _ in range(count)]
+    fast = _best(lambda: [rsa.gcd(a, b) for a, b in pairs], repeat)
+    slow = _best(lambda: [euclid(a, b) for a, b in pairs], repeat)
+    return {"count": count, "bits": bits, "euclid": slow, "gcd": fast, "speedup": slow / fast}
+
+
+def bench_keygen(bits: int = 1024, keys: int = 10) -> tp.Dict[str, float]:
+    """Latency percentiles of rsa.generate_keypair in milliseconds."""
+    samples = []
+    for _ in range(keys):
+        start = time.perf_counter()
+        rsa.generate_keypair(bits=bits)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"bits": bits, "keys": keys, **rsa_keygen.percentiles(samples)}
+
+
+def bench_throughput(bits: int = 1024, size: int = 256, repeat: int = 3) -> tp.Dict[str, float]:
+    """
+    Characters per second of a size character text in every mode:
+    character mode with a plain (d, n) key, with the CRT of a PrivateKey
+    and with a fresh Codebook, and block mode with both kinds of key.
+    """
+    public, private = rsa.generate_keypair(bits=bits)
+    plain = (private.d, private.n)
+    rng = random.Random(size)
+    text = "".join(rng.choice(string.ascii_letters + " ") for _ in range(size))
+    chars = rsa.encrypt(public, text)
+    blocks = rsa.encrypt_blocks(public, text)
+    cases: tp.Dict[str, tp.Callable[[], tp.Any]] = {
+        "encrypt_chars": lambda: rsa.encrypt(public, text),
+        "decrypt_chars": lambda: rsa.decrypt(plain, chars),
+        "decrypt_chars_crt": lambda: rsa.decrypt(private, chars),
+        "encrypt_codebook": lambda: rsa.Codebook(public).encrypt(text),
+        "decrypt_codebook": lambda: rsa.Codebook(private).decrypt(chars),
+        "encrypt_blocks": lambda: rsa.encrypt_blocks(public, text),
+        "decrypt_blocks": lambda: rsa.decrypt_blocks(plain, blocks),
+        "decrypt_blocks_crt": lambda: rsa.decrypt_blocks(private, blocks),
+    }
+    report: tp.Dict[str, float] = {"bits": bits, "size": size}
+    for name, case in cases.items():
+        report[name] = size / _best(case, repeat)
+    return report
+
+
+@contextlib.contextmanager
+def _timed(names: tp.Sequence[str]) -> tp.Iterator[tp.Dict[str, tp.List[float]]]:
+    # Swaps the rsa functions for wrappers adding up their calls and seconds.
+    totals = {name: [0, 0.0] for name in names}
+    originals = {name: getattr(rsa, name) for name in names}
+
+    def wrap(name: str, func: tp.Callable[..., tp.Any]) -> tp.Callable[..., tp.Any]:
+        def timed(*args: tp.Any, **kwargs: tp.Any) -> tp.Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[name][0] += 1
+                totals[name][1] += time.perf_counter() - start
+
+        return timed
+
+    for name, func in originals.items():
+        setattr(rsa, name, wrap(name, func))
+    try:
+        yield totals
+    finally:
+        for name, func in originals.items():
+            setattr(rsa, name, func)
+
+
+def bench_hotspots(bits: int = 1024, keys: int = 10) -> tp.Dict[str, tp.Any]:
+    """
+    Calls of and seconds spent in each of HOTSPOTS while generating keys
+    keypairs, next to the total seconds of key generation.
+    """
+    with _timed(HOTSPOTS) as totals:
+        start = time.perf_counter()
+        for _ in range(keys):
+            rsa.generate_keypair(bits=bits)
+        seconds = time.perf_counter() - start
+    report: tp.Dict[str, tp.Any] = {"bits": bits, "keys": keys, "seconds": seconds}
+    for name, (calls, spent) in totals.items():
+        report[name] = {"calls": calls, "seconds": spent, "share": spent / seconds}
+    return report
+
+
+def top_functions(profile: cProfile.Profile, limit: int = 20) -> tp.List[tp.Dict[str, tp.Any]]:
+    """The limit functions with the most own time in profile."""
+    stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {"function": f"{path}:{line}({name})", "calls": calls, "tottime": tottime, "cumtime": cumtime}
+        for (path, line, name), (_, calls, tottime, cumtime, _) in rows
+    ]
+
+
+def run(
+    sections: tp.Sequence[str] = SECTIONS,
+    bits: tp.Sequence[int] = (512, 1024, 2048),
+    count: int = 1000,
+    keys: int = 10,
+    size: int = 256,
+    profile: tp.Optional[str] = None,
+    trace_memory: bool = False,
+) -> tp.Dict[str, tp.Any]:
+    """
+    Runs the chosen sections for every key size and returns the report.
+    With profile the whole run is profiled, the stats are dumped to that
+    path and the top functions are added to the report. With trace_memory
+    the peak traced memory of every section is added.
+    """
+    benches: tp.Dict[str, tp.Callable[[int], tp.Dict[str, tp.Any]]] = {
+        "inverse": lambda bits: bench_inverse(count, bits),
+        "gcd": lambda bits: bench_gcd(count, bits),
+        "keygen": lambda bits: bench_keygen(bits, keys),
+        "throughput": lambda bits: bench_throughput(bits, size),
+        "hotspots": lambda bits: bench_hotspots(bits, keys),
+    }
+    report: tp.Dict[str, tp.Any] = {"python": platform.python_version(), "platform": platform.platform()}
+    memory = {}
+    profiler = cProfile.Profile() if profile else None
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for section in sections:
+            if trace_memory:
+                tracemalloc.reset_peak()
+            if profiler:
+                profiler.enable()
+            report[section] = [benches[section](key_size) for key_size in bits]
+            if profiler:
+                profiler.disable()
+            if trace_memory:
+                memory[section] = tracemalloc.get_traced_memory()[1]
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    if profiler and profile:
+        profiler.dump_stats(profile)
+        report["profile"] = {"path": profile, "top": top_functions(profiler)}
+    if trace_memory:
+        report["peak_memory"] = memory
+    return report
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks for rsa.py, the report is printed as JSON.")
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--bits", type=int, nargs="+", default=[512, 1024, 2048])
+    parser.add_argument("--count", type=int, default=1000, help="values for the inverse and gcd sections")
+    parser.add_argument("--keys", type=int, default=10, help="keys for the keygen and hotspots sections")
+    parser.add_argument("--size", type=int, default=256, help="text length for the throughput section")
+    parser.add_argument("--profile", metavar="PATH", help="profile with cProfile and dump the stats to PATH")
+    parser.add_argument("--tracemalloc", action="store_true", help="report the peak memory of every section")
+    parser.add_argument("--output", metavar="PATH", help="write the report to PATH instead of stdout")
+    args = parser.parse_args(argv)
+    report = run(args.sections, args.bits, args.count, args.keys, args.size, args.profile, args.tracemalloc)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import array
+import io
+import struct
+import sys
+import typing as tp
+
+import rsa
+
+Key = tp.Union[rsa.PrivateKey, tp.Tuple[int, int]]
+
+# magic, block width in bytes
+_CIPHERTEXT_HEADER = struct.Struct(">4sH")
+_CIPHERTEXT_MAGIC = b"RSAC"
+# magic, key type, number of fields
+_KEY_HEADER = struct.Struct(">4sBB")
+_KEY_MAGIC = b"RSAK"
+_FIELD_LENGTH = struct.Struct(">I")
+PAIR_KEY = 0
+PRIVATE_KEY = 1
+
+# Numbers converted at once when streaming ciphertext.
+BATCH_SIZE = 1 << 12
+# Widths that fit a machine integer go through array instead of int.to_bytes.
+_TYPECODES = {array.array(code).itemsize: code for code in "BHIQ"}
+
+
+def _to_bytes(numbers: tp.List[int], width: int) -> bytes:
+    if width in _TYPECODES:
+        packed = array.array(_TYPECODES[width], numbers)
+        if sys.byteorder == "little":
+            packed.byteswap()
+        return packed.tobytes()
+    return b"".join(number.to_bytes(width, "big") for number in numbers)
+
+
+def _from_bytes(data: bytes, width: int) -> tp.List[int]:
+    if width in _TYPECODES:
+        packed = array.array(_TYPECODES[width])
+        packed.frombytes(data)
+        if sys.byteorder == "little":
+            packed.byteswap()
+        return packed.tolist()
+    return [int.from_bytes(data[start : start + width], "big") for start in range(0, len(data), width)]
+
+
+def write_ciphertext(f: tp.BinaryIO, ciphertext: tp.Iterable[int], n: int) -> int:
+    """
+    Writes numbers below n (the output of rsa.encrypt or a generator of
+    them) as a short header followed by rsa.modulus_size(n) big-endian
+    bytes per number. Returns the number of numbers written.
+    """
+    width = rsa.modulus_size(n)
+    f.write(_CIPHERTEXT_HEADER.pack(_CIPHERTEXT_MAGIC, width))
+    count = 0
+    iterator = iter(ciphertext)
+    while batch := [number for _, number in zip(range(BATCH_SIZE), iterator)]:
+        f.write(_to_bytes(batch, width))
+        count += len(batch)
+    return count
+
+
+def iter_ciphertext(f: tp.BinaryIO) -> tp.Iterator[int]:
+    """Reads the numbers written by write_ciphertext back one batch at a time."""
+    header = f.read(_CIPHERTEXT_HEADER.size)
+    if len(header) < _CIPHERTEXT_HEADER.size:
+        raise ValueError("truncated ciphertext header")
+    magic, width = _CIPHERTEXT_HEADER.unpack(header)
+    if magic != _CIPHERTEXT_MAGIC or width == 0:
+        raise ValueError("not an RSA ciphertext")
+    # Reads may come back short (pipes, sockets), a partial number waits for the next one.
+    leftover = b""
+    while data := f.read(BATCH_SIZE * width):
+        data = leftover + data
+        whole = len(data) - len(data) % width
+        leftover = data[whole:]
+        yield from _from_bytes(data[:whole], width)
+    if leftover:
+        raise ValueError("truncated ciphertext")
+
+
+def dump_ciphertext(ciphertext: tp.Iterable[int], n: int) -> bytes:
+    """
+    >>> data = dump_ciphertext([3000, 3179], 3233)
+    >>> data.hex()
+    '5253414300020bb80c6b'
+    >>> load_ciphertext(data)
+    [3000, 3179]
+    """
+    f = io.BytesIO()
+    write_ciphertext(f, ciphertext, n)
+    return f.getvalue()
+
+
+def load_ciphertext(data: bytes) -> tp.List[int]:
+    return list(iter_ciphertext(io.BytesIO(data)))
+
+
+def write_key(f: tp.BinaryIO, key: Key) -> None:
+    """
+    Writes a key as a header and length-prefixed big-endian numbers: all
+    of d, n, p, q, dp, dq and qinv for a PrivateKey, the two numbers of
+    any other (e, n) or (d, n) pair.
+    """
+    if isinstance(key, rsa.PrivateKey):
+        kind, fields = PRIVATE_KEY, [key.d, key.n, key.p, key.q, key.dp, key.dq, key.qinv]
+    else:
+        kind, fields = PAIR_KEY, list(key)
+    f.write(_KEY_HEADER.pack(_KEY_MAGIC, kind, len(fields)))
+    for field in fields:
+        data = field.to_bytes((field.bit_length() + 7) // 8, "big")
+        f.write(_FIELD_LENGTH.pack(len(data)))
+        f.write(data)
+
+
+def _read_exactly(f: tp.BinaryIO, size: int) -> bytes:
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("truncated key")
+    return data
+
+
+def read_key(f: tp.BinaryIO) -> Key:
+    """Reads a key written by write_key, PrivateKey keys come back without recomputing anything."""
+    magic, kind, count = _KEY_HEADER.unpack(_read_exactly(f, _KEY_HEADER.size))
+    if magic != _KEY_MAGIC or (kind, count) not in [(PAIR_KEY, 2), (PRIVATE_KEY, 7)]:
+        raise ValueError("not an RSA key")
+    fields = []
+    for _ in range(count):
+        (length,) = _FIELD_LENGTH.unpack(_read_exactly(f, _FIELD_LENGTH.size))
+        fields.append(int.from_bytes(_read_exactly(f, length), "big"))
+    if kind == PRIVATE_KEY:
+        return rsa.PrivateKey.from_components(*fields)
+    return fields[0], fields[1]
+
+
+def dump_key(key: Key) -> bytes:
+    """
+    >>> load_key(dump_key((17, 3233)))
+    (17, 3233)
+    >>> load_key(dump_key(rsa.PrivateKey(2753, 3233, 61, 53)))
+    PrivateKey(d=2753, n=3233, p=61, q=53)
+    """
+    f = io.BytesIO()
+    write_key(f, key)
+    return f.getvalue()
+
+
+def load_key(data: bytes) -> Key:
+    return read_key(io.BytesIO(data))
@@ -0,0 +1,168 @@
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+import typing as tp
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+
+import rsa
+
+Keypair = tp.Tuple[tp.Tuple[int, int], rsa.PrivateKey]
+
+# Candidates tested by one task, a prime found elsewhere stops the search after the current batch.
+BATCH_SIZE = 16
+POOL_SIZE = 8
+
+
+def _search(bits: int, attempts: int) -> tp.Optional[int]:
+    prime = rsa.find_prime(bits, attempts)
+    return prime if prime is not None and rsa.usable_prime(prime) else None
+
+
+def _parallel_primes(executor: Executor, bits: int, count: int, workers: int, batch: int) -> tp.List[int]:
+    primes: tp.List[int] = []
+    pending = {executor.submit(_search, bits, batch) for _ in range(workers)}
+    try:
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prime = future.result()
+                if prime is not None and prime not in primes:
+                    primes.append(prime)
+                    if len(primes) == count:
+                        return primes
+                pending.add(executor.submit(_search, bits, batch))
+    finally:
+        # Queued batches are dropped, running ones are left to finish on their own.
+        for future in pending:
+            future.cancel()
+
+
+def generate_keypair_parallel(
+    bits: int = rsa.DEFAULT_KEY_SIZE,
+    workers: tp.Optional[int] = None,
+    executor: tp.Optional[Executor] = None,
+    batch: int = BATCH_SIZE,
+) -> Keypair:
+    """
+    Same keys as rsa.generate_keypair(bits=bits), with the prime search
+    spread over workers processes. Each of them tests batches of batch
+    candidates and the search stops as soon as both primes are found.
+    Pass an executor to reuse one process pool for many keys.
+    """
+    if bits < 16:
+        raise ValueError("key size must be at least 16 bits")
+    workers = workers or os.cpu_count() or 1
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as own_executor:
+            return generate_keypair_parallel(bits, workers, own_executor, batch)
+    if bits % 2 == 0:
+        return rsa.keypair_from_primes(*_parallel_primes(executor, bits // 2, 2, workers, batch))
+    (p,) = _parallel_primes(executor, bits // 2, 1, workers, batch)
+    (q,) = _parallel_primes(executor, bits - bits // 2, 1, workers, batch)
+    return rsa.keypair_from_primes(p, q)
+
+
+def percentiles(samples: tp.Sequence[float], points: tp.Sequence[int] = (50, 95, 99)) -> tp.Dict[str, float]:
+    """
+    >>> percentiles([1.0, 2.0, 3.0, 4.0], [50])
+    {'p50': 2.5}
+    """
+    if len(samples) < 2:
+        return {f"p{point}": samples[0] if samples else 0.0 for point in points}
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {f"p{point}": quantiles[point - 1] for point in points}
+
+
+class KeyPool:
+    """
+    Keys generated ahead of time by a pool of worker processes.
+
+    Up to size keys are kept ready, every get starts the generation of a
+    replacement. Waiting times of get are recorded, see stats.
+
+    >>> with KeyPool(bits=256, size=2, workers=1) as pool:
+    ...     public, private = pool.get()
+    >>> public[1].bit_length()
+    256
+    """
+
+    def __init__(self, bits: int = rsa.DEFAULT_KEY_SIZE, size: int = POOL_SIZE, workers: tp.Optional[int] = None):
+        self.bits = bits
+        self.size = size
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._ready: "queue.Queue[Future]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies: tp.List[float] = []
+        for _ in range(size):
+            self._refill()
+
+    def _refill(self) -> None:
+        future = self._executor.submit(rsa.generate_keypair, bits=self.bits)
+        future.add_done_callback(self._ready.put)
+
+    def get(self, timeout: tp.Optional[float] = None) -> Keypair:
+        """Takes a ready key, waiting for one if there are none, raises queue.Empty after timeout."""
+        start = time.perf_counter()
+        future = self._ready.get(timeout=timeout)
+        self._refill()
+        keypair = future.result()
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+        return keypair
+
+    def ready(self) -> int:
+        return self._ready.qsize()
+
+    def stats(self) -> tp.Dict[str, float]:
+        """Number of keys handed out, keys ready and get latency percentiles in milliseconds."""
+        with self._lock:
+            latencies = [latency * 1000 for latency in self._latencies]
+        return {"keys": len(latencies), "ready": self.ready(), **percentiles(latencies)}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "KeyPool":
+        return self
+
+    def __exit__(self, *args: tp.Any) -> None:
+        self.close()
+
+
+def latency_report(bits: int, keys: int, workers: tp.Optional[int] = None) -> tp.Dict[str, tp.Dict[str, float]]:
+    """Key generation latency percentiles in milliseconds, sequential against parallel search."""
+    workers = workers or os.cpu_count() or 1
+    sequential = []
+    for _ in range(keys):
+        start = time.perf_counter()
+        rsa.generate_keypair(bits=bits)
+        sequential.append((time.perf_counter() - start) * 1000)
+    parallel = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for _ in range(keys):
+            start = time.perf_counter()
+            generate_keypair_parallel(bits, workers, executor)
+            parallel.append((time.perf_counter() - start) * 1000)
+    return {"sequential": percentiles(sequential), "parallel": percentiles(parallel)}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(f"usage: {sys.argv[0]} BITS [KEYS] [WORKERS]")
+        sys.exit(1)
+    report = latency_report(
+        int(sys.argv[1]),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        int(sys.argv[3]) if len(sys.argv) > 3 else None,
+    )
+    for mode, row in report.items():
+        print(f"{mode:10} " + " ".join(f"{name} {value:9.1f} ms" for name, value in row.items()))
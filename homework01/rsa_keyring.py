@@ -0,0 +1,160 @@
+import functools
+import hashlib
+import mmap
+import os
+import pathlib
+import struct
+import typing as tp
+
+import rsa
+import rsa_format
+
+PathLike = tp.Union[str, pathlib.Path]
+Keypair = tp.Tuple[tp.Tuple[int, int], rsa.PrivateKey]
+
+KEY_CACHE_SIZE = 128
+
+# key id, length of the public key, length of the private key; the keys follow in rsa_format
+_RECORD = struct.Struct(">8sII")
+_MAGIC = b"RSKR"
+
+
+def key_id(public: tp.Tuple[int, int]) -> str:
+    """
+    First 8 bytes of the SHA-256 of the serialized public key, in hex.
+
+    >>> key_id((17, 3233))
+    'dd7e3f8e897dd424'
+    """
+    return hashlib.sha256(rsa_format.dump_key((public[0], public[1]))).hexdigest()[:16]
+
+
+class Keyring:
+    """
+    Keypairs stored in a single append-only file.
+
+    Every record is written with one write and fsynced. A partial record
+    at the end, left by an add that was interrupted, is cut off when the
+    file is opened.
+
+    The file is memory-mapped and indexed by key id when opened, a lookup
+    parses the keys straight from the map, private keys come back with
+    their CRT values as stored. Parsed keypairs are kept in an LRU cache
+    of cache_size entries, so repeated use of a key does not touch the
+    file at all.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp, Keyring(pathlib.Path(tmp) / "keys") as keyring:
+    ...     kid = keyring.add(*rsa.generate_keypair(61, 53))
+    ...     private = keyring.private_key(kid)
+    >>> private.p, private.q
+    (61, 53)
+    """
+
+    def __init__(self, path: PathLike, cache_size: int = KEY_CACHE_SIZE) -> None:
+        self.path = pathlib.Path(path)
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self.path.write_bytes(_MAGIC)
+        self._file = open(self.path, "rb")
+        self._map: tp.Optional[mmap.mmap] = None
+        self._index: tp.Dict[str, tp.Tuple[int, int, int]] = {}
+        self._indexed = 0
+        self._load = functools.lru_cache(maxsize=cache_size)(self._parse)
+        try:
+            self._remap()
+        except ValueError:
+            self.close()
+            raise
+
+    def _remap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._indexed == 0:
+            if self._map[: len(_MAGIC)] != _MAGIC:
+                raise ValueError(f"{self.path} is not a keyring")
+            self._indexed = len(_MAGIC)
+        # Only records appended since the last look are scanned.
+        offset = self._indexed
+        while offset + _RECORD.size <= len(self._map):
+            raw_id, public_length, private_length = _RECORD.unpack_from(self._map, offset)
+            start = offset + _RECORD.size
+            end = start + public_length + private_length
+            if end > len(self._map):
+                break
+            self._index[raw_id.hex()] = (start, public_length, private_length)
+            offset = end
+        self._indexed = offset
+        if offset < len(self._map):
+            # A partial record left by an interrupted add, cut it off so new records follow the last whole one.
+            self._map.close()
+            os.truncate(self.path, offset)
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _parse(self, kid: str) -> Keypair:
+        if self._map is None:
+            raise ValueError("keyring is closed")
+        start, public_length, private_length = self._index[kid]
+        public = rsa_format.load_key(self._map[start : start + public_length])
+        private = rsa_format.load_key(self._map[start + public_length : start + public_length + private_length])
+        if not isinstance(private, rsa.PrivateKey):
+            raise ValueError(f"key {kid} has no CRT values")
+        return (public[0], public[1]), private
+
+    def add(self, public: tp.Tuple[int, int], private: rsa.PrivateKey) -> str:
+        """Appends a keypair unless it is there already, returns its key id."""
+        kid = key_id(public)
+        if kid in self._index:
+            return kid
+        public_data = rsa_format.dump_key((public[0], public[1]))
+        private_data = rsa_format.dump_key(private)
+        record = _RECORD.pack(bytes.fromhex(kid), len(public_data), len(private_data)) + public_data + private_data
+        with open(self.path, "ab") as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        self._remap()
+        return kid
+
+    def generate(self, bits: int = rsa.DEFAULT_KEY_SIZE) -> str:
+        """Generates a new keypair with rsa.generate_keypair and stores it."""
+        return self.add(*rsa.generate_keypair(bits=bits))
+
+    def get(self, kid: str) -> Keypair:
+        if kid not in self._index:
+            raise KeyError(kid)
+        return self._load(kid)
+
+    def public_key(self, kid: str) -> tp.Tuple[int, int]:
+        return self.get(kid)[0]
+
+    def private_key(self, kid: str) -> rsa.PrivateKey:
+        return self.get(kid)[1]
+
+    def decrypt_blocks(self, kid: str, ciphertext: bytes) -> str:
+        return rsa.decrypt_blocks(self.private_key(kid), ciphertext)
+
+    def cache_info(self) -> "functools._CacheInfo":
+        return self._load.cache_info()
+
+    def ids(self) -> tp.List[str]:
+        return list(self._index)
+
+    def __contains__(self, kid: object) -> bool:
+        return kid in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._load.cache_clear()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "Keyring":
+        return self
+
+    def __exit__(self, *args: tp.Any) -> None:
+        self.close()
@@ -0,0 +1,65 @@
+import importlib
+import random
+import unittest
+
+import caesar
+import vigenere
+from alphabet import CYRILLIC, CYRILLIC_YO, LATIN, Alphabet
+
+growing_shift = importlib.import_module("защита01")
+
+
+class AlphabetTestCase(unittest.TestCase):
+    def test_index(self):
+        self.assertEqual(26, len(LATIN))
+        self.assertEqual(32, len(CYRILLIC))
+        self.assertEqual(33, len(CYRILLIC_YO))
+        self.assertEqual(6, CYRILLIC_YO.index("Ё"))
+        self.assertEqual(31, CYRILLIC.index("я"))
+        self.assertNotIn("ё", CYRILLIC)
+        with self.assertRaises(ValueError):
+            LATIN.index("1")
+
+    def test_custom_alphabet(self):
+        with self.assertRaises(ValueError):
+            Alphabet("aab")
+        binary = Alphabet("01", upper="01")
+        self.assertEqual("1010 2", caesar.CaesarKey(1, binary).encrypt("0101 2"))
+
+    def test_growing_shift(self):
+        self.assertEqual(
+            "Рунйоэ, эые! Утыэв ШП о",
+            growing_shift.encrypt_growing_shift("Привет, мир! Hello ЁЖ ё", 1, 2),
+        )
+        self.assertEqual("бд\udc80йм", growing_shift.encrypt_growing_shift("аб\udc80вг", 1, 2))
+        plaintext = "".join(random.choice(CYRILLIC.lower + CYRILLIC.upper + " ,.") for _ in range(500))
+        for start, delta in ((0, 0), (3, 1), (5, 4), (-7, 33), (1, -2)):
+            with self.subTest(start=start, delta=delta):
+                ciphertext = growing_shift.encrypt_growing_shift(plaintext, start, delta)
+                self.assertEqual(plaintext, growing_shift.decrypt_growing_shift(ciphertext, start, delta))
+
+    def test_growing_shift_with_yo(self):
+        plaintext = "Ёжик ёлку нёс"
+        ciphertext = growing_shift.encrypt_growing_shift(plaintext, 2, 3, CYRILLIC_YO)
+        self.assertEqual(plaintext, growing_shift.decrypt_growing_shift(ciphertext, 2, 3, CYRILLIC_YO))
+
+    def test_caesar_and_vigenere(self):
+        plaintext = "Съешь же ещё этих мягких французских булок, да выпей чаю"
+        for alphabet in (CYRILLIC, CYRILLIC_YO):
+            with self.subTest(alphabet=alphabet):
+                key = caesar.compile_caesar(40, alphabet)
+                self.assertEqual(40 % len(alphabet), key.shift)
+                self.assertEqual(plaintext, key.decrypt(key.encrypt(plaintext)))
+                vigenere_key = vigenere.compile_vigenere("ключ", alphabet)
+                ciphertext = vigenere_key.encrypt(plaintext)
+                self.assertEqual(plaintext, vigenere_key.decrypt(ciphertext))
+                self.assertEqual(
+                    ciphertext.encode("cp1251"), vigenere_key.encrypt_bytes(plaintext.encode("cp1251"))
+                )
+
+    def test_latin_alphabet_matches_default(self):
+        plaintext = "Introduction to Python"
+        self.assertEqual(
+            vigenere.encrypt_vigenere(plaintext, "lsci"),
+            vigenere.compile_vigenere("lsci", LATIN).encrypt(plaintext),
+        )
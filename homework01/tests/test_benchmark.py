@@ -0,0 +1,41 @@
+import json
+import unittest
+
+import benchmark
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    def test_run(self):
+        results = benchmark.run(sizes=[256], mixes=["mixed", "cyrillic"], key_lengths=[1, 8], repeat=1)
+        names = {result.name for result in results}
+        self.assertEqual(
+            {
+                "encrypt_caesar",
+                "decrypt_caesar",
+                "encrypt_vigenere",
+                "decrypt_vigenere",
+                "encrypt_growing_shift",
+                "rsa_encrypt",
+                "rsa_decrypt",
+                "rsa_encrypt_chars",
+                "rsa_decrypt_chars",
+                "rsa_encrypt_blocks",
+                "rsa_decrypt_blocks",
+                "rsa_encrypt_codebook",
+                "rsa_decrypt_codebook",
+            },
+            names,
+        )
+        self.assertEqual(2 * 15, len(results))
+        for result in results:
+            self.assertGreater(result.mb_per_s, 0)
+            self.assertGreaterEqual(result.peak_bytes, 0)
+        report = json.loads(json.dumps(benchmark.to_json(results)))
+        self.assertEqual(len(results), len(report["results"]))
+
+    def test_find_regressions(self):
+        result = benchmark.Result("encrypt_caesar", "letters", 1024, 1, 0.1, 10.0, 0)
+        baseline = {"results": [{"case_id": result.case_id, "mb_per_s": 20.0}]}
+        self.assertEqual(1, len(benchmark.find_regressions([result], baseline, threshold=0.2)))
+        self.assertEqual([], benchmark.find_regressions([result], baseline, threshold=0.6))
+        self.assertEqual([], benchmark.find_regressions([result], {"results": []}))
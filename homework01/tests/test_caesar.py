@@ -1,3 +1,4 @@
+import io
 import random
 import string
 import unittest
@@ -57,3 +58,59 @@ class CaesarTestCase(unittest.TestCase):
             caesar.decrypt_caesar(ciphertext, shift=shift),
             msg=f"shift={shift}, ciphertext={ciphertext}",
         )
+
+    def test_bytes(self):
+        plaintext = "".join(
+            random.choice(string.ascii_letters + string.digits + " -,") for _ in range(256)
+        )
+        shift = random.randint(0, 25)
+        ciphertext = caesar.encrypt_caesar_bytes(plaintext.encode(), shift=shift)
+        self.assertEqual(caesar.encrypt_caesar(plaintext, shift=shift).encode(), ciphertext)
+        self.assertEqual(plaintext.encode(), caesar.decrypt_caesar_bytes(ciphertext, shift=shift))
+
+    def test_into(self):
+        plaintext = "".join(
+            random.choice(string.ascii_letters + string.digits + " -,") for _ in range(200_000)
+        )
+        shift = random.randint(0, 25)
+        buffer = bytearray(plaintext.encode())
+        self.assertEqual(len(buffer), caesar.encrypt_caesar_into(buffer, shift=shift))
+        self.assertEqual(caesar.encrypt_caesar(plaintext, shift=shift).encode(), buffer)
+        out = bytearray(len(buffer))
+        caesar.decrypt_caesar_into(memoryview(buffer), shift=shift, out=out)
+        self.assertEqual(plaintext.encode(), out)
+        with self.assertRaises(TypeError):
+            caesar.encrypt_caesar_into(plaintext.encode(), shift=shift)
+
+    def test_non_ascii(self):
+        self.assertEqual("Fgysvi, Zruog", caesar.encrypt_caesar("Привет, World", shift=3))
+
+    def test_stream(self):
+        shift = random.randint(0, 25)
+        plaintext = "".join(
+            random.choice(string.ascii_letters + " -,") for _ in range(1000)
+        )
+        dst = io.StringIO()
+        caesar.encrypt_caesar_stream(io.StringIO(plaintext), dst, shift=shift, chunk_size=7)
+        self.assertEqual(caesar.encrypt_caesar(plaintext, shift=shift), dst.getvalue())
+
+        dst_bytes = io.BytesIO()
+        caesar.decrypt_caesar_stream(
+            io.BytesIO(dst.getvalue().encode()), dst_bytes, shift=shift, chunk_size=7
+        )
+        self.assertEqual(plaintext.encode(), dst_bytes.getvalue())
+
+    def test_batch(self):
+        items = [
+            ("".join(random.choice(string.ascii_letters + " -,") for _ in range(20)), random.randint(0, 60))
+            for _ in range(50)
+        ]
+        ciphertexts = caesar.encrypt_caesar_batch(items)
+        self.assertEqual([caesar.encrypt_caesar(m, s) for m, s in items], ciphertexts)
+        self.assertEqual(
+            [m for m, _ in items],
+            caesar.decrypt_caesar_batch(zip(ciphertexts, (s for _, s in items))),
+        )
+        info = caesar.caesar_cache_info()
+        self.assertEqual(caesar.KEY_CACHE_SIZE, info.maxsize)
+        self.assertGreater(info.hits, 0)
@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+
+import caesar
+import cipher_aio
+import vigenere
+
+
+class CipherAioTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.key = vigenere.compile_vigenere("LEMON")
+        self.server = await cipher_aio.start_server(cipher_aio.echo, "127.0.0.1", 0, self.key)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_echo(self):
+        reader, writer = await cipher_aio.open_connection("127.0.0.1", self.port, self.key)
+        for line in [b"attack at dawn\n", b"x\n", b"Hello, World!\n"]:
+            writer.write(line)
+            await writer.drain()
+            self.assertEqual(line, await reader.readline())
+        self.assertEqual(writer.offset, reader.offset)
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_readuntil(self):
+        reader, writer = await cipher_aio.open_connection("127.0.0.1", self.port, self.key)
+        writer.write(b"attack -- at dawn END")
+        await writer.drain()
+        self.assertEqual(b"attack --", await reader.readuntil(b"--"))
+        with self.assertRaises(ValueError):
+            await reader.readuntil(b"END")
+        with self.assertRaises(ValueError):
+            await reader.readuntil(b"x")
+        self.assertEqual(b" at dawn END", await reader.readexactly(12))
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_wire(self):
+        plaintext = b"ATTACK AT DAWN, attack at dawn\n"
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        ciphertext = vigenere.encrypt_vigenere_bytes(plaintext, "LEMON")
+        # Send in uneven pieces, the server keeps its phase across reads.
+        for start in range(0, len(ciphertext), 7):
+            writer.write(ciphertext[start : start + 7])
+            await writer.drain()
+        self.assertEqual(ciphertext, await reader.readexactly(len(ciphertext)))
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_proxy(self):
+        proxy = await cipher_aio.start_proxy("127.0.0.1", 0, "127.0.0.1", self.port, self.key)
+        self.addAsyncCleanup(proxy.wait_closed)
+        self.addCleanup(proxy.close)
+        reader, writer = await asyncio.open_connection("127.0.0.1", proxy.sockets[0].getsockname()[1])
+        writer.write(b"plain text through the proxy\n")
+        self.assertEqual(b"plain text through the proxy\n", await reader.readline())
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_caesar(self):
+        key = caesar.compile_caesar(5)
+        server = await cipher_aio.start_server(cipher_aio.echo, "127.0.0.1", 0, key)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        report = await cipher_aio.load_test("127.0.0.1", server.sockets[0].getsockname()[1], key, 50, rounds=3)
+        self.assertEqual(50, report["succeeded"])
+
+    async def test_load(self):
+        report = await cipher_aio.load_test("127.0.0.1", self.port, self.key, 200, rounds=2)
+        self.assertEqual(200, report["succeeded"])
+        self.assertGreater(report["round_trips_per_s"], 0)
@@ -0,0 +1,77 @@
+import pathlib
+import random
+import string
+import tempfile
+import unittest
+
+import caesar
+import cipher_mmap
+import vigenere
+
+
+class CipherMmapTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.plaintext = "".join(
+            random.choice(string.ascii_letters + string.digits + " -,\n") for _ in range(10_000)
+        ).encode()
+        self.path = pathlib.Path(self.tmp.name) / "data"
+        self.path.write_bytes(self.plaintext)
+
+    def test_vigenere(self):
+        keyword = "".join(random.choice(string.ascii_letters) for _ in range(7))
+        cipher_mmap.encrypt_vigenere_inplace(self.path, keyword, window=1000)
+        self.assertEqual(
+            vigenere.encrypt_vigenere_bytes(self.plaintext, keyword), self.path.read_bytes()
+        )
+        self.assertFalse(cipher_mmap.checkpoint_path(self.path).exists())
+        cipher_mmap.decrypt_vigenere_inplace(self.path, keyword, window=999)
+        self.assertEqual(self.plaintext, self.path.read_bytes())
+
+    def test_caesar(self):
+        cipher_mmap.encrypt_caesar_inplace(self.path, 5, window=4096)
+        self.assertEqual(caesar.encrypt_caesar_bytes(self.plaintext, 5), self.path.read_bytes())
+        cipher_mmap.decrypt_caesar_inplace(self.path, 5)
+        self.assertEqual(self.plaintext, self.path.read_bytes())
+
+    def test_resume_after_interruption(self):
+        keyword = "lemon"
+        key = vigenere.compile_vigenere(keyword)
+        calls = []
+
+        def crashing_transform(data, offset):
+            calls.append(offset)
+            if len(calls) == 4:
+                # Simulate a crash after part of the window hit the disk.
+                raise KeyboardInterrupt
+            return key.encrypt_into(data, offset=offset)
+
+        operation = f"vigenere:encrypt:{keyword}"
+        with self.assertRaises(KeyboardInterrupt):
+            cipher_mmap._transform_inplace(self.path, operation, crashing_transform, 1000)
+        self.assertTrue(cipher_mmap.checkpoint_path(self.path).exists())
+
+        # Scribble over the window that was being written when the crash happened.
+        data = bytearray(self.path.read_bytes())
+        data[3000:3500] = key.encrypt_bytes(bytes(data[3000:3500]), 3000)
+        self.path.write_bytes(bytes(data))
+
+        processed = cipher_mmap._transform_inplace(
+            self.path, operation, lambda data, offset: key.encrypt_into(data, offset=offset), 1000
+        )
+        self.assertEqual(7000, processed)
+        self.assertEqual(vigenere.encrypt_vigenere_bytes(self.plaintext, keyword), self.path.read_bytes())
+        self.assertFalse(cipher_mmap.checkpoint_path(self.path).exists())
+
+    def test_checkpoint_of_other_operation(self):
+        with self.assertRaises(KeyboardInterrupt):
+            cipher_mmap._transform_inplace(
+                self.path, "caesar:encrypt:3", lambda data, offset: (_ for _ in ()).throw(KeyboardInterrupt), 1000
+            )
+        with self.assertRaises(ValueError):
+            cipher_mmap.encrypt_caesar_inplace(self.path, 4)
+
+    def test_empty_file(self):
+        self.path.write_bytes(b"")
+        self.assertEqual(0, cipher_mmap.encrypt_vigenere_inplace(self.path, "key"))
@@ -0,0 +1,54 @@
+import pathlib
+import random
+import string
+import tempfile
+import unittest
+
+import caesar
+import cipher_parallel
+import vigenere
+
+
+class CipherParallelTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.plaintext = "".join(
+            random.choice(string.ascii_letters + " -,\n") for _ in range(10_000)
+        ).encode()
+        self.src = pathlib.Path(self.tmp.name) / "plain"
+        self.enc = pathlib.Path(self.tmp.name) / "enc"
+        self.dec = pathlib.Path(self.tmp.name) / "dec"
+        self.src.write_bytes(self.plaintext)
+
+    def test_vigenere(self):
+        keyword = "".join(random.choice(string.ascii_letters) for _ in range(7))
+        cipher_parallel.encrypt_vigenere_file(self.src, self.enc, keyword, workers=2, chunk_size=1000)
+        self.assertEqual(
+            vigenere.encrypt_vigenere(self.plaintext.decode(), keyword).encode(),
+            self.enc.read_bytes(),
+        )
+        cipher_parallel.decrypt_vigenere_file(self.enc, self.dec, keyword, workers=3, chunk_size=999)
+        self.assertEqual(self.plaintext, self.dec.read_bytes())
+
+    def test_caesar(self):
+        shift = random.randint(0, 25)
+        cipher_parallel.encrypt_caesar_file(self.src, self.enc, shift, workers=2, chunk_size=1000)
+        self.assertEqual(
+            caesar.encrypt_caesar(self.plaintext.decode(), shift).encode(),
+            self.enc.read_bytes(),
+        )
+        cipher_parallel.decrypt_caesar_file(self.enc, self.dec, shift, workers=2, chunk_size=777)
+        self.assertEqual(self.plaintext, self.dec.read_bytes())
+
+    def test_empty_file(self):
+        self.src.write_bytes(b"")
+        self.assertEqual(0, cipher_parallel.encrypt_vigenere_file(self.src, self.enc, "key"))
+        self.assertEqual(b"", self.enc.read_bytes())
+
+    def test_same_file(self):
+        with self.assertRaises(ValueError):
+            cipher_parallel.encrypt_vigenere_file(self.src, self.src, "key")
+        with self.assertRaises(ValueError):
+            cipher_parallel.decrypt_caesar_file(self.src, pathlib.Path(self.tmp.name) / "." / "plain")
+        self.assertEqual(self.plaintext, self.src.read_bytes())
@@ -0,0 +1,65 @@
+import random
+import unittest
+
+import caesar
+import cryptanalysis
+import vigenere
+
+ENGLISH_TEXT = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, "
+    "it was the age of foolishness, it was the epoch of belief, it was the epoch of "
+    "incredulity, it was the season of Light, it was the season of Darkness, it was "
+    "the spring of hope, it was the winter of despair, we had everything before us, "
+    "we had nothing before us, we were all going direct to Heaven, we were all going "
+    "direct the other way."
+)
+
+RUSSIAN_TEXT = (
+    "Все счастливые семьи похожи друг на друга, каждая несчастливая семья несчастлива "
+    "по-своему. Все смешалось в доме Облонских. Жена узнала, что муж был в связи с "
+    "бывшею в их доме француженкою-гувернанткой, и объявила мужу, что не может жить "
+    "с ним в одном доме."
+)
+
+
+class CryptanalysisTestCase(unittest.TestCase):
+    def test_crack_caesar(self):
+        for shift in range(26):
+            with self.subTest(shift=shift):
+                guess = cryptanalysis.crack_caesar(caesar.encrypt_caesar(ENGLISH_TEXT, shift))
+                self.assertEqual(shift, guess.shift)
+                self.assertEqual(ENGLISH_TEXT, guess.plaintext)
+
+    def test_crack_caesar_russian(self):
+        shift = random.randint(1, 31)
+        ciphertext = cryptanalysis._rotate(RUSSIAN_TEXT, cryptanalysis.RUSSIAN_ALPHABET, shift)
+        guess = cryptanalysis.crack_caesar(ciphertext, language="ru")
+        self.assertEqual(shift, guess.shift)
+        self.assertEqual(RUSSIAN_TEXT, guess.plaintext)
+
+    def test_ranking(self):
+        guess = cryptanalysis.crack_caesar(caesar.encrypt_caesar(ENGLISH_TEXT, 5))
+        self.assertEqual(26, len(guess.ranking))
+        self.assertEqual(5, guess.ranking[0][0])
+        scores = [score for _, score, _ in guess.ranking]
+        self.assertEqual(sorted(scores), scores)
+        self.assertAlmostEqual(1.0, sum(confidence for _, _, confidence in guess.ranking))
+        self.assertGreater(guess.ranking[0][2], 0.99)
+
+    def test_crack_vigenere(self):
+        plaintext = ENGLISH_TEXT * 4
+        for keyword in ("lemon", "python", "cryptanalysis"):
+            with self.subTest(keyword=keyword):
+                guess = cryptanalysis.crack_vigenere(vigenere.encrypt_vigenere(plaintext, keyword))
+                self.assertEqual(keyword, guess.keyword)
+                self.assertEqual(len(keyword), guess.key_lengths[0][0])
+                self.assertEqual(plaintext, guess.plaintext)
+
+    def test_index_of_coincidence(self):
+        histogram = cryptanalysis.letter_histogram(ENGLISH_TEXT)
+        self.assertAlmostEqual(0.066, cryptanalysis.index_of_coincidence(histogram), delta=0.01)
+        self.assertEqual(0.0, cryptanalysis.index_of_coincidence([1, 0, 0]))
+
+    def test_unknown_language(self):
+        with self.assertRaises(ValueError):
+            cryptanalysis.crack_caesar("abc", language="xx")
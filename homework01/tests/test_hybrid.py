@@ -0,0 +1,55 @@
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+
+import hybrid
+import rsa
+import rsa_format
+import vigenere
+
+
+class HybridTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.public, cls.private = rsa.generate_keypair(bits=1024)
+
+    def test_stream(self):
+        plaintext = os.urandom(100_000) + b"Attack at dawn!"
+        encrypted = io.BytesIO()
+        self.assertEqual(len(plaintext), hybrid.encrypt_stream(io.BytesIO(plaintext), encrypted, self.public, 4096))
+        encrypted.seek(0)
+        keyword = hybrid.read_keyword(encrypted, self.private)
+        self.assertEqual(hybrid.KEYWORD_LENGTH, len(keyword))
+        self.assertEqual(vigenere.encrypt_vigenere_bytes(plaintext, keyword), encrypted.read())
+
+        encrypted.seek(0)
+        decrypted = io.BytesIO()
+        self.assertEqual(len(plaintext), hybrid.decrypt_stream(encrypted, decrypted, self.private, 999))
+        self.assertEqual(plaintext, decrypted.getvalue())
+
+    def test_fresh_keyword(self):
+        first, second = io.BytesIO(), io.BytesIO()
+        hybrid.encrypt_stream(io.BytesIO(b"text"), first, self.public)
+        hybrid.encrypt_stream(io.BytesIO(b"text"), second, self.public)
+        self.assertNotEqual(first.getvalue(), second.getvalue())
+
+    def test_bad_header(self):
+        with self.assertRaises(ValueError):
+            hybrid.decrypt_stream(io.BytesIO(b"XXXX\0\0\0\0"), io.BytesIO(), self.private)
+        encrypted = io.BytesIO()
+        hybrid.encrypt_stream(io.BytesIO(b"text"), encrypted, self.public)
+        with self.assertRaises(ValueError):
+            hybrid.decrypt_stream(io.BytesIO(encrypted.getvalue()[:20]), io.BytesIO(), self.private)
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp)
+            plaintext = b"Hello, World!\n" * 1000
+            (path / "plain").write_bytes(plaintext)
+            hybrid.main(["keygen", str(path / "pub"), str(path / "priv"), "--bits", "512"])
+            hybrid.main(["encrypt", str(path / "pub"), str(path / "plain"), str(path / "enc")])
+            hybrid.main(["decrypt", str(path / "priv"), str(path / "enc"), str(path / "dec")])
+            self.assertEqual(plaintext, (path / "dec").read_bytes())
+            self.assertIsInstance(rsa_format.load_key((path / "priv").read_bytes()), rsa.PrivateKey)
@@ -1,4 +1,5 @@
 import random
+import threading
 import unittest
 
 import rsa
@@ -46,3 +47,125 @@ class RSATestCase(unittest.TestCase):
         self.assertEqual(
             ((9678731, 11188147), (1804547, 11188147)), rsa.generate_keypair(3259, 3433)
         )
+
+    def test_encrypt_decrypt(self):
+        public, private = rsa.generate_keypair(1229, 1381)
+        message = "Hello, World! Привет"
+        ciphertext = rsa.encrypt(public, message)
+        self.assertEqual(message, rsa.decrypt(private, ciphertext))
+        self.assertEqual(message, rsa.decrypt(tuple(private), ciphertext))
+        self.assertEqual(ciphertext, [pow(ord(char), *public) for char in message])
+
+    def test_private_key(self):
+        _, private = rsa.generate_keypair(3259, 3433)
+        d, n = private
+        self.assertEqual((private.p, private.q), (3259, 3433))
+        self.assertEqual(1, private.qinv * private.q % private.p)
+        for c in random.sample(range(n), 100):
+            self.assertEqual(pow(c, d, n), private.power(c))
+        with self.assertRaises(ValueError):
+            rsa.PrivateKey(d, n + 1, 3259, 3433)
+
+    def test_is_prime_large(self):
+        self.assertTrue(rsa.is_prime(2**127 - 1))
+        self.assertTrue(rsa.is_prime(2**521 - 1))
+        self.assertFalse(rsa.is_prime((2**61 - 1) * (2**89 - 1)))
+        # Carmichael number and strong pseudoprimes to the first bases.
+        self.assertFalse(rsa.is_prime(561))
+        self.assertFalse(rsa.is_prime(3215031751))
+        self.assertFalse(rsa.is_prime(3317044064679887385961981))
+
+    def test_generate_prime(self):
+        for bits in [2, 16, 64, 512]:
+            prime = rsa.generate_prime(bits)
+            self.assertEqual(bits, prime.bit_length())
+            self.assertTrue(rsa.is_prime(prime))
+        self.assertEqual(rsa.generate_prime(64, random.Random(1)), rsa.generate_prime(64, random.Random(1)))
+
+    def test_generate_keypair_bits(self):
+        public, private = rsa.generate_keypair(bits=1024)
+        self.assertEqual(rsa.PUBLIC_EXPONENT, public[0])
+        self.assertEqual(1024, public[1].bit_length())
+        self.assertEqual(public[1], private.p * private.q)
+        self.assertEqual("Hello", rsa.decrypt(private, rsa.encrypt(public, "Hello")))
+        with self.assertRaises(ValueError):
+            rsa.generate_keypair(17)
+
+    def test_blocks(self):
+        public, private = rsa.generate_keypair(bits=512)
+        size = rsa.modulus_size(public[1])
+        for message in ["", "x", "Hello, World! Привет, мир! " * 20]:
+            ciphertext = rsa.encrypt_blocks(public, message)
+            blocks = -(-len(message.encode()) // (size - rsa.PADDING_SIZE))
+            self.assertEqual(blocks * size, len(ciphertext))
+            self.assertEqual(message, rsa.decrypt_blocks(private, ciphertext))
+            self.assertEqual(message, rsa.decrypt_blocks(tuple(private), ciphertext))
+        # Padding is random, the same message encrypts differently every time.
+        self.assertNotEqual(rsa.encrypt_blocks(public, "abc"), rsa.encrypt_blocks(public, "abc"))
+
+    def test_blocks_errors(self):
+        public, private = rsa.generate_keypair(bits=512)
+        ciphertext = rsa.encrypt_blocks(public, "Hello")
+        with self.assertRaises(ValueError):
+            rsa.decrypt_blocks(private, ciphertext[:-1])
+        with self.assertRaises(ValueError):
+            rsa.decrypt_blocks(private, bytes(len(ciphertext)))
+        with self.assertRaises(ValueError):
+            rsa.encrypt_blocks((17, 3233), "Hello")
+
+    def test_sieve(self):
+        self.assertEqual([2, 3, 5, 7], rsa.primes_below(10))
+        self.assertEqual(1229, len(rsa.primes_below(10_000)))
+        self.assertTrue(rsa.is_prime(1_000_003))
+        self.assertFalse(rsa.is_prime(1_000_001))
+        info = rsa.sieve_info()
+        self.assertGreater(info.limit, 1_000_003)
+        self.assertLessEqual(info.size_bytes, info.max_bytes)
+        self.assertEqual(2 * info.max_bytes, rsa.extend_sieve(10 * info.max_bytes))
+        self.assertEqual(info.max_bytes, rsa.sieve_info().size_bytes)
+        with self.assertRaises(ValueError):
+            rsa.primes_below(10 * info.max_bytes)
+
+    def test_sieve_threads(self):
+        # Start from an empty sieve, so the threads grow it while the others read it.
+        saved = rsa._sieve
+        self.addCleanup(setattr, rsa, "_sieve", saved)
+        rsa._sieve = bytearray(1)
+        composites = [p * q for p, q in zip(rsa.SMALL_PRIMES[1:], rsa.SMALL_PRIMES[2:])]
+        errors = []
+
+        def check(numbers):
+            errors.extend(n for n in numbers if rsa.is_prime(n))
+
+        threads = [threading.Thread(target=check, args=(composites[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(rsa.SMALL_PRIMES, rsa.primes_below(rsa.PREFILTER_LIMIT))
+
+    def test_codebook(self):
+        public, private = rsa.generate_keypair(bits=256)
+        message = "abracadabra, Привет!" * 10
+        ciphertext = rsa.encrypt(public, message, codebook=True)
+        self.assertEqual(rsa.encrypt(public, message), ciphertext)
+        self.assertEqual(message, rsa.decrypt(private, ciphertext, codebook=True))
+        info = rsa.get_codebook(private).cache_info()["decrypt"]
+        self.assertEqual(len(set(message)), info.misses)
+        self.assertEqual(len(message) - len(set(message)), info.hits)
+
+        book = rsa.Codebook(private, maxsize=2)
+        self.assertEqual(message, book.decrypt(ciphertext))
+        self.assertEqual(2, book.cache_info()["decrypt"].currsize)
+
+    def test_batch_inverse(self):
+        phi = 1694640
+        values = [e for e in range(3, 2000, 2) if rsa.gcd(e, phi) == 1]
+        self.assertEqual([rsa.multiplicative_inverse(e, phi) for e in values], rsa.batch_inverse(values, phi))
+        self.assertEqual([], rsa.batch_inverse([], phi))
+        self.assertEqual([23], rsa.batch_inverse([7], 40))
+        with self.assertRaises(ValueError):
+            rsa.batch_inverse([7, 4, 9], 40)
+        with self.assertRaises(ValueError):
+            rsa.multiplicative_inverse(4, 40)
@@ -0,0 +1,53 @@
+import unittest
+
+import rsa
+import rsa_batch
+
+
+class RSABatchTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.public, cls.private = rsa.generate_keypair(bits=512)
+
+    def test_order_is_kept_across_chunks(self):
+        plaintexts = [f"message {i}" for i in range(50)]
+        messages = [rsa.encrypt_blocks(self.public, plaintext) for plaintext in plaintexts]
+        decrypted = list(rsa_batch.decrypt_batch(self.private, messages, workers=2, chunksize=3))
+        self.assertEqual(plaintexts, decrypted)
+
+    def test_generator_of_mixed_messages(self):
+        plaintexts = [f"msg {i}" for i in range(20)]
+
+        def messages():
+            for i, plaintext in enumerate(plaintexts):
+                if i % 2:
+                    yield rsa.encrypt(self.public, plaintext)
+                else:
+                    yield rsa.encrypt_blocks(self.public, plaintext)
+
+        with rsa_batch.BatchDecryptor(self.private, workers=2, chunksize=4) as decryptor:
+            self.assertEqual(plaintexts, list(decryptor.decrypt(messages())))
+            stats = decryptor.stats()
+        self.assertEqual(20, stats["messages"])
+        self.assertEqual(10 + sum(len(plaintexts[i]) for i in range(1, 20, 2)), stats["exponentiations"])
+        self.assertEqual(
+            {"messages", "exponentiations", "seconds", "messages_per_s", "exponentiations_per_s"}, set(stats)
+        )
+
+    def test_codebook_saves_exponentiations(self):
+        plaintext = "aaaa bbbb aaaa"
+        messages = [rsa.encrypt(self.public, plaintext) for _ in range(10)]
+        with rsa_batch.BatchDecryptor(self.private, workers=1, codebook=True) as decryptor:
+            self.assertEqual([plaintext] * 10, list(decryptor.decrypt(messages)))
+            self.assertEqual(3, decryptor.stats()["exponentiations"])
+
+    def test_empty_batch(self):
+        with rsa_batch.BatchDecryptor(self.private, workers=1) as decryptor:
+            self.assertEqual([], list(decryptor.decrypt([])))
+            self.assertEqual(0, decryptor.stats()["messages_per_s"])
+
+    def test_tune_chunksize(self):
+        sample = [rsa.encrypt_blocks(self.public, str(i)) for i in range(20)]
+        best, rates = rsa_batch.tune_chunksize(self.private, sample, workers=1, candidates=(1, 8))
+        self.assertIn(best, (1, 8))
+        self.assertEqual({1, 8}, set(rates))
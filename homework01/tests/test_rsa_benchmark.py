@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+import unittest
+
+import rsa_benchmark
+
+
+class RSABenchmarkTestCase(unittest.TestCase):
+    def test_bench_inverse(self):
+        report = rsa_benchmark.bench_inverse(count=50, bits=256, repeat=1)
+        self.assertEqual(50, report["count"])
+        self.assertGreater(report["speedup"], 0)
+
+    def test_bench_gcd(self):
+        report = rsa_benchmark.bench_gcd(count=50, bits=256, repeat=1)
+        self.assertGreater(report["speedup"], 0)
+
+    def test_bench_keygen(self):
+        report = rsa_benchmark.bench_keygen(bits=128, keys=3)
+        self.assertEqual({"bits", "keys", "p50", "p95", "p99"}, set(report))
+        self.assertLessEqual(report["p50"], report["p99"])
+
+    def test_bench_throughput(self):
+        report = rsa_benchmark.bench_throughput(bits=256, size=32, repeat=1)
+        for mode in ["chars", "chars_crt", "codebook", "blocks", "blocks_crt"]:
+            self.assertGreater(report[f"decrypt_{mode}"], 0)
+
+    def test_bench_hotspots_restores_functions(self):
+        originals = [rsa_benchmark.rsa.is_prime, rsa_benchmark.rsa.gcd, rsa_benchmark.rsa.multiplicative_inverse]
+        report = rsa_benchmark.bench_hotspots(bits=128, keys=2)
+        self.assertGreater(report["is_prime"]["calls"], 0)
+        self.assertGreaterEqual(report["multiplicative_inverse"]["calls"], 2)
+        self.assertEqual(
+            originals,
+            [rsa_benchmark.rsa.is_prime, rsa_benchmark.rsa.gcd, rsa_benchmark.rsa.multiplicative_inverse],
+        )
+
+    def test_run_is_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rsa.prof")
+            report = rsa_benchmark.run(["keygen"], bits=[128], keys=2, profile=path, trace_memory=True)
+            self.assertTrue(os.path.exists(path))
+        report = json.loads(json.dumps(report))
+        self.assertEqual(128, report["keygen"][0]["bits"])
+        self.assertTrue(report["profile"]["top"])
+        self.assertIn("keygen", report["peak_memory"])
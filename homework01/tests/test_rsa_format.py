@@ -0,0 +1,72 @@
+import io
+import random
+import unittest
+
+import rsa
+import rsa_format
+
+
+class RSAFormatTestCase(unittest.TestCase):
+    def test_ciphertext(self):
+        for bits in [12, 16, 32, 64, 512]:
+            n = random.getrandbits(bits) | (1 << (bits - 1))
+            ciphertext = [random.randrange(n) for _ in range(3 * rsa_format.BATCH_SIZE + 5)]
+            data = rsa_format.dump_ciphertext(ciphertext, n)
+            self.assertEqual(6 + len(ciphertext) * rsa.modulus_size(n), len(data))
+            self.assertEqual(ciphertext, rsa_format.load_ciphertext(data))
+
+    def test_stream(self):
+        public, private = rsa.generate_keypair(bits=256)
+        message = "Hello, World! Привет, мир!" * 500
+        f = io.BytesIO()
+        count = rsa_format.write_ciphertext(f, (pow(ord(char), *public) for char in message), public[1])
+        self.assertEqual(len(message), count)
+        f.seek(0)
+        self.assertEqual(message, "".join(chr(private.power(c)) for c in rsa_format.iter_ciphertext(f)))
+
+    def test_short_reads(self):
+        numbers = [random.randrange(1 << 256) for _ in range(100)]
+        data = rsa_format.dump_ciphertext(numbers, 1 << 256)
+
+        class ShortReads(io.BytesIO):
+            def read(self, size=-1):
+                return super().read(min(size, 7) if size >= 0 else 7)
+
+        self.assertEqual(numbers, list(rsa_format.iter_ciphertext(ShortReads(data))))
+        with self.assertRaises(ValueError):
+            list(rsa_format.iter_ciphertext(ShortReads(data[:-5])))
+
+    def test_bad_ciphertext(self):
+        data = rsa_format.dump_ciphertext([1, 2, 3], 3233)
+        with self.assertRaises(ValueError):
+            rsa_format.load_ciphertext(data[:-1])
+        with self.assertRaises(ValueError):
+            rsa_format.load_ciphertext(b"XXXX" + data[4:])
+        with self.assertRaises(ValueError):
+            rsa_format.load_ciphertext(data[:3])
+        self.assertEqual([], rsa_format.load_ciphertext(rsa_format.dump_ciphertext([], 3233)))
+
+    def test_keys(self):
+        public, private = rsa.generate_keypair(bits=512)
+        self.assertEqual(public, rsa_format.load_key(rsa_format.dump_key(public)))
+        loaded = rsa_format.load_key(rsa_format.dump_key(private))
+        self.assertIsInstance(loaded, rsa.PrivateKey)
+        self.assertEqual(private, loaded)
+        self.assertEqual(
+            (private.p, private.q, private.dp, private.dq, private.qinv),
+            (loaded.p, loaded.q, loaded.dp, loaded.dq, loaded.qinv),
+        )
+        data = rsa_format.dump_key(private)
+        self.assertLess(len(data), 5 * 64 + 7 * 4 + 6 + 1)
+        with self.assertRaises(ValueError):
+            rsa_format.load_key(data[:-1])
+        with self.assertRaises(ValueError):
+            rsa_format.load_key(b"XXXX" + data[4:])
+
+    def test_file(self):
+        f = io.BytesIO()
+        rsa_format.write_key(f, (17, 3233))
+        rsa_format.write_key(f, rsa.PrivateKey(2753, 3233, 61, 53))
+        f.seek(0)
+        self.assertEqual((17, 3233), rsa_format.read_key(f))
+        self.assertEqual((2753, 3233), rsa_format.read_key(f))
@@ -0,0 +1,35 @@
+import queue
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import rsa
+import rsa_keygen
+
+
+class RSAKeygenTestCase(unittest.TestCase):
+    def test_generate_keypair_parallel(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            for bits in [512, 513]:
+                public, private = rsa_keygen.generate_keypair_parallel(bits, workers=2, executor=executor, batch=4)
+                self.assertEqual(bits, public[1].bit_length())
+                self.assertEqual(rsa.PUBLIC_EXPONENT, public[0])
+                self.assertTrue(rsa.is_prime(private.p) and rsa.is_prime(private.q))
+                self.assertEqual("Hello", rsa.decrypt(private, rsa.encrypt(public, "Hello")))
+
+    def test_key_pool(self):
+        with rsa_keygen.KeyPool(bits=256, size=2, workers=2) as pool:
+            keys = [pool.get(timeout=60) for _ in range(5)]
+            stats = pool.stats()
+        self.assertEqual(5, len({public for public, _ in keys}))
+        self.assertEqual(5, stats["keys"])
+        self.assertLessEqual(stats["p50"], stats["p99"])
+
+    def test_key_pool_timeout(self):
+        with rsa_keygen.KeyPool(bits=1024, size=1, workers=1) as pool:
+            with self.assertRaises(queue.Empty):
+                pool.get(timeout=0.0001)
+
+    def test_percentiles(self):
+        self.assertEqual({"p50": 0.0, "p95": 0.0, "p99": 0.0}, rsa_keygen.percentiles([]))
+        report = rsa_keygen.percentiles([float(i) for i in range(101)])
+        self.assertEqual({"p50": 50.0, "p95": 95.0, "p99": 99.0}, report)
@@ -0,0 +1,72 @@
+import pathlib
+import tempfile
+import unittest
+
+import rsa
+import rsa_keyring
+
+
+class RSAKeyringTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = pathlib.Path(self.tmp.name) / "keyring"
+
+    def test_add_and_reopen(self):
+        keypairs = [rsa.generate_keypair(bits=512) for _ in range(3)]
+        with rsa_keyring.Keyring(self.path) as keyring:
+            ids = [keyring.add(*keypair) for keypair in keypairs]
+            self.assertEqual(ids[0], keyring.add(*keypairs[0]))
+            self.assertEqual(3, len(keyring))
+        with rsa_keyring.Keyring(self.path) as keyring:
+            self.assertEqual(ids, keyring.ids())
+            for kid, (public, private) in zip(ids, keypairs):
+                self.assertIn(kid, keyring)
+                self.assertEqual(public, keyring.public_key(kid))
+                loaded = keyring.private_key(kid)
+                self.assertEqual(
+                    (private.p, private.q, private.dp, private.dq, private.qinv),
+                    (loaded.p, loaded.q, loaded.dp, loaded.dq, loaded.qinv),
+                )
+            kid = keyring.generate(bits=256)
+            self.assertEqual(4, len(keyring))
+            public = keyring.public_key(kid)
+            self.assertEqual("Hello", keyring.decrypt_blocks(kid, rsa.encrypt_blocks(public, "Hello")))
+            with self.assertRaises(KeyError):
+                keyring.get("0" * 16)
+
+    def test_cache(self):
+        with rsa_keyring.Keyring(self.path, cache_size=1) as keyring:
+            first = keyring.generate(bits=256)
+            second = keyring.generate(bits=256)
+            self.assertIs(keyring.get(first), keyring.get(first))
+            keyring.get(second)
+            keyring.get(first)
+            info = keyring.cache_info()
+            self.assertEqual((1, 3, 1), (info.hits, info.misses, info.currsize))
+
+    def test_bad_file(self):
+        self.path.write_bytes(b"something else")
+        with self.assertRaises(ValueError):
+            rsa_keyring.Keyring(self.path)
+
+    def test_interrupted_add(self):
+        with rsa_keyring.Keyring(self.path) as keyring:
+            first = keyring.generate(bits=256)
+            second = keyring.generate(bits=256)
+        data = self.path.read_bytes()
+        # End of the first record
+        _, public_length, private_length = rsa_keyring._RECORD.unpack_from(data, len(rsa_keyring._MAGIC))
+        complete = len(rsa_keyring._MAGIC) + rsa_keyring._RECORD.size + public_length + private_length
+        for cut in [complete + 3, complete + rsa_keyring._RECORD.size + 5, len(data) - 1]:
+            with self.subTest(cut=cut):
+                self.path.write_bytes(data[:cut])
+                with rsa_keyring.Keyring(self.path) as keyring:
+                    self.assertEqual([first], keyring.ids())
+                    self.assertIsNotNone(keyring.private_key(first))
+                    third = keyring.generate(bits=256)
+                self.assertEqual(data[:complete], self.path.read_bytes()[:complete])
+                with rsa_keyring.Keyring(self.path) as keyring:
+                    self.assertEqual([first, third], keyring.ids())
+                    self.assertNotIn(second, keyring)
+                    keyring.private_key(third)
@@ -1,7 +1,9 @@
+import io
 import random
 import string
 import unittest
 
+import alphabet
 import vigenere
 
 
@@ -46,3 +48,89 @@ class VigenereTestCase(unittest.TestCase):
         )
         ciphertext = vigenere.encrypt_vigenere(plaintext, keyword)
         self.assertEqual(plaintext, vigenere.decrypt_vigenere(ciphertext, keyword))
+
+    def test_bytes(self):
+        keyword = "".join(random.choice(string.ascii_letters) for _ in range(7))
+        plaintext = "".join(
+            random.choice(string.ascii_letters + string.digits + " -,") for _ in range(256)
+        )
+        ciphertext = vigenere.encrypt_vigenere_bytes(plaintext.encode(), keyword)
+        self.assertEqual(vigenere.encrypt_vigenere(plaintext, keyword).encode(), ciphertext)
+        self.assertEqual(plaintext.encode(), vigenere.decrypt_vigenere_bytes(ciphertext, keyword))
+
+    def test_into(self):
+        keyword = "".join(random.choice(string.ascii_letters) for _ in range(7))
+        plaintext = "".join(
+            random.choice(string.ascii_letters + string.digits + " -,") for _ in range(200_000)
+        )
+        ciphertext = vigenere.encrypt_vigenere(plaintext, keyword).encode()
+        buffer = bytearray(plaintext.encode())
+        self.assertEqual(len(buffer), vigenere.encrypt_vigenere_into(buffer, keyword))
+        self.assertEqual(ciphertext, buffer)
+        out = bytearray(len(buffer))
+        vigenere.decrypt_vigenere_into(memoryview(buffer), keyword, out)
+        self.assertEqual(plaintext.encode(), out)
+
+        key = vigenere.compile_vigenere(keyword)
+        key.decrypt_into(memoryview(buffer)[1000:], offset=1000)
+        self.assertEqual(ciphertext[:1000] + plaintext.encode()[1000:], buffer)
+        with self.assertRaises(ValueError):
+            vigenere.encrypt_vigenere_into(buffer, keyword, bytearray(10))
+
+    def test_into_reuses_scratch(self):
+        key = vigenere.compile_vigenere("LEMON")
+        key.encrypt_into(bytearray(b"x" * 100_000))
+        scratch = alphabet._local.scratch
+        for size in (1, 5, 17, 1000):
+            plaintext = "".join(random.choice(string.ascii_letters + " ") for _ in range(size))
+            buffer = bytearray(plaintext.encode())
+            key.encrypt_into(buffer)
+            self.assertEqual(vigenere.encrypt_vigenere(plaintext, "LEMON").encode(), buffer)
+        self.assertIs(scratch, alphabet._local.scratch)
+
+    def test_non_ascii(self):
+        self.assertEqual("Nhhdfq, Kbcpp", vigenere.encrypt_vigenere("Привет, World", "lemon"))
+        self.assertEqual("kf\udc80mh", vigenere.encrypt_vigenere("ab\udc80cd", "key"))
+        self.assertEqual("ab\udc80cd", vigenere.decrypt_vigenere("kf\udc80mh", "key"))
+
+    def test_keyword_with_multichar_case(self):
+        for keyword in ["ß", "keyᾠ", "İ"]:
+            with self.subTest(keyword=keyword):
+                with self.assertRaises(ValueError):
+                    vigenere.encrypt_vigenere("python", keyword)
+
+    def test_stream(self):
+        keyword = "".join(random.choice(string.ascii_letters) for _ in range(7))
+        plaintext = "".join(
+            random.choice(string.ascii_letters + " -,") for _ in range(1000)
+        )
+        expected = vigenere.encrypt_vigenere(plaintext, keyword)
+        for chunk_size in (1, 3, 7, 64, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                dst = io.StringIO()
+                vigenere.encrypt_vigenere_stream(
+                    io.StringIO(plaintext), dst, keyword, chunk_size=chunk_size
+                )
+                self.assertEqual(expected, dst.getvalue())
+
+                dst_bytes = io.BytesIO()
+                vigenere.decrypt_vigenere_stream(
+                    io.BytesIO(expected.encode()), dst_bytes, keyword, chunk_size=chunk_size
+                )
+                self.assertEqual(plaintext.encode(), dst_bytes.getvalue())
+
+    def test_batch(self):
+        keywords = ["".join(random.choice(string.ascii_letters) for _ in range(5)) for _ in range(3)]
+        items = [
+            ("".join(random.choice(string.ascii_letters + " -,") for _ in range(20)), random.choice(keywords))
+            for _ in range(50)
+        ]
+        before = vigenere.vigenere_cache_info()
+        ciphertexts = vigenere.encrypt_vigenere_batch(items)
+        after = vigenere.vigenere_cache_info()
+        self.assertEqual([vigenere.encrypt_vigenere(m, k) for m, k in items], ciphertexts)
+        self.assertLessEqual(after.hits + after.misses - before.hits - before.misses, len(keywords))
+        self.assertEqual(
+            [m for m, _ in items],
+            vigenere.decrypt_vigenere_batch(zip(ciphertexts, (k for _, k in items))),
+        )
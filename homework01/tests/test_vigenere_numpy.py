@@ -0,0 +1,37 @@
+import random
+import string
+import unittest
+
+import vigenere
+
+try:
+    import vigenere_numpy
+except ImportError:
+    vigenere_numpy = None  # type: ignore
+
+
+@unittest.skipIf(vigenere_numpy is None, "numpy is not installed")
+class VigenereNumpyTestCase(unittest.TestCase):
+    def test_matches_vigenere(self):
+        for kwlen in (1, 4, 13):
+            keyword = "".join(random.choice(string.ascii_letters) for _ in range(kwlen))
+            plaintext = "".join(random.choice(string.ascii_letters + string.digits + " -,\n") for _ in range(5000))
+            expected = vigenere.encrypt_vigenere(plaintext, keyword).encode()
+            with self.subTest(keyword=keyword):
+                ciphertext = vigenere_numpy.encrypt_vigenere_array(plaintext.encode(), keyword)
+                self.assertEqual(expected, bytes(ciphertext))
+                self.assertEqual(
+                    plaintext.encode(),
+                    bytes(vigenere_numpy.decrypt_vigenere_array(memoryview(ciphertext), keyword)),
+                )
+
+    def test_non_alpha_keyword(self):
+        plaintext = "Hello, World"
+        expected = vigenere.encrypt_vigenere(plaintext, "k3y!").encode()
+        self.assertEqual(expected, bytes(vigenere_numpy.encrypt_vigenere_array(plaintext.encode(), "k3y!")))
+
+    def test_out_buffer(self):
+        out = bytearray(12)
+        result = vigenere_numpy.encrypt_vigenere_array(b"ATTACKATDAWN", "LEMON", offset=0, out=out)
+        self.assertIs(out, result)
+        self.assertEqual(bytearray(b"LXFOPVEFRNHR"), out)
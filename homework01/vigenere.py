@@ -1,3 +1,162 @@
+import collections
+import functools
+import typing as tp
+
+from alphabet import (
+    LATIN,
+    Alphabet,
+    BytesLike,
+    ShiftTable,
+    read_chunks,
+    translate_periodic,
+    translate_periodic_bytes,
+    translate_periodic_into,
+    write_chunks,
+)
+
+KEY_CACHE_SIZE = 4096
+
+
+def _shift_char(char: str, upper_shift: int, lower_shift: int) -> str:
+    if char.isupper():
+        return chr((ord(char) - ord("A") + upper_shift) % 26 + ord("A"))
+    if char.islower():
+        return chr((ord(char) - ord("a") + lower_shift) % 26 + ord("a"))
+    return char
+
+
+@functools.lru_cache(maxsize=None)
+def _legacy_table(upper_shift: int, lower_shift: int) -> ShiftTable:
+    fallback = functools.partial(_shift_char, upper_shift=upper_shift, lower_shift=lower_shift)
+    return LATIN.shift_table(lower_shift, upper_shift, fallback)
+
+
+@functools.lru_cache(maxsize=None)
+def _alphabet_table(alphabet: Alphabet, shift: int) -> ShiftTable:
+    return alphabet.shift_table(shift)
+
+
+class VigenereKey:
+    """
+    Vigenere keyword compiled into one translation table per keyword letter.
+
+    Every character of the text advances the keyword, letters or not.
+    Tables are shared between keys, so there are at most 26 of them for
+    alphabetic keywords. Without an alphabet ASCII letters are shifted
+    and other letters keep the behaviour of encrypt_vigenere, with one
+    the keyword and the shifted letters come from it.
+
+    >>> key = VigenereKey("LEMON")
+    >>> key.encrypt("ATTACKATDAWN")
+    'LXFOPVEFRNHR'
+    >>> key.decrypt_bytes(b"LXFOPVEFRNHR")
+    b'ATTACKATDAWN'
+    >>> import alphabet
+    >>> VigenereKey("бв", alphabet.CYRILLIC).encrypt("Ящик")
+    'Аыйм'
+    """
+
+    def __init__(self, keyword: str, alphabet: tp.Optional[Alphabet] = None) -> None:
+        if not keyword:
+            raise ValueError("keyword must not be empty")
+        self.keyword = keyword
+        self.alphabet = alphabet
+        if alphabet is None:
+            for k in keyword:
+                if len(k.upper()) != 1 or len(k.lower()) != 1:
+                    raise ValueError(f"keyword character {k!r} changes length with case")
+            shifts = [((ord(k.upper()) - ord("A")) % 26, (ord(k.lower()) - ord("a")) % 26) for k in keyword]
+            self._encrypt_tables = [_legacy_table(u, l) for u, l in shifts]
+            self._decrypt_tables = [_legacy_table(-u % 26, -l % 26) for u, l in shifts]
+        else:
+            size = len(alphabet)
+            indices = [alphabet.index(k) for k in keyword]
+            self._encrypt_tables = [_alphabet_table(alphabet, i) for i in indices]
+            self._decrypt_tables = [_alphabet_table(alphabet, -i % size) for i in indices]
+        self._codec = (alphabet or LATIN).codec
+        self._encrypt_byte_tables = self._byte_tables(self._encrypt_tables)
+        self._decrypt_byte_tables = self._byte_tables(self._decrypt_tables)
+
+    def __len__(self) -> int:
+        return len(self.keyword)
+
+    def _byte_tables(self, tables: tp.Sequence[ShiftTable]) -> tp.Optional[tp.List[bytes]]:
+        if self._codec is None:
+            return None
+        byte_tables = [table.byte_table(self._codec) for table in tables]
+        if any(table is None for table in byte_tables):
+            return None
+        return tp.cast(tp.List[bytes], byte_tables)
+
+    def _translate(
+        self, text: str, tables: tp.Sequence[ShiftTable], byte_tables: tp.Optional[tp.List[bytes]], offset: int
+    ) -> str:
+        if byte_tables is not None and self._codec is not None:
+            try:
+                data = text.encode(self._codec)
+            except UnicodeEncodeError:
+                pass
+            else:
+                return translate_periodic_bytes(data, byte_tables, offset).decode(self._codec)
+        return translate_periodic(text, tables, offset)
+
+    def encrypt(self, plaintext: str, offset: int = 0) -> str:
+        """
+        Encrypts plaintext as if it started at position offset of a longer text.
+
+        >>> VigenereKey("LEMON").encrypt("ACKAT", offset=3)
+        'OPVEF'
+        """
+        return self._translate(plaintext, self._encrypt_tables, self._encrypt_byte_tables, offset)
+
+    def decrypt(self, ciphertext: str, offset: int = 0) -> str:
+        return self._translate(ciphertext, self._decrypt_tables, self._decrypt_byte_tables, offset)
+
+    def _checked(self, byte_tables: tp.Optional[tp.List[bytes]]) -> tp.List[bytes]:
+        if byte_tables is None:
+            raise ValueError(f"{self.alphabet!r} has no single-byte encoding")
+        return byte_tables
+
+    def encrypt_bytes(self, data: bytes, offset: int = 0) -> bytes:
+        """Shifts letters encoded with the alphabet codec (ASCII by default), every other byte is left as is."""
+        return translate_periodic_bytes(data, self._checked(self._encrypt_byte_tables), offset)
+
+    def decrypt_bytes(self, data: bytes, offset: int = 0) -> bytes:
+        return translate_periodic_bytes(data, self._checked(self._decrypt_byte_tables), offset)
+
+    def encrypt_into(self, data: BytesLike, out: tp.Optional[BytesLike] = None, offset: int = 0) -> int:
+        """
+        Encrypts a buffer in place, or into out when given, and returns
+        the number of bytes written. Temporaries stay within BLOCK_SIZE, see
+        translate_periodic_into.
+
+        >>> buffer = bytearray(b"ATTACKATDAWN")
+        >>> VigenereKey("LEMON").encrypt_into(memoryview(buffer)[3:8], offset=3)
+        5
+        >>> buffer
+        bytearray(b'ATTOPVEFDAWN')
+        """
+        return translate_periodic_into(data, self._checked(self._encrypt_byte_tables), out, offset)
+
+    def decrypt_into(self, data: BytesLike, out: tp.Optional[BytesLike] = None, offset: int = 0) -> int:
+        return translate_periodic_into(data, self._checked(self._decrypt_byte_tables), out, offset)
+
+
+def compile_vigenere(keyword: str, alphabet: tp.Optional[Alphabet] = None) -> VigenereKey:
+    """Compiled keys are kept in an LRU cache of KEY_CACHE_SIZE entries, see vigenere_cache_info."""
+    return _compile_vigenere(keyword, alphabet)
+
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile_vigenere(keyword: str, alphabet: tp.Optional[Alphabet]) -> VigenereKey:
+    return VigenereKey(keyword, alphabet)
+
+
+def vigenere_cache_info() -> "functools._CacheInfo":
+    """Hits, misses and current size of the compiled key cache."""
+    return _compile_vigenere.cache_info()
+
+
 def encrypt_vigenere(plaintext: str, keyword: str) -> str:
     """
     Encrypts plaintext using a Vigenere cipher.
@@ -8,22 +167,7 @@ def encrypt_vigenere(plaintext: str, keyword: str) -> str:
     >>> encrypt_vigenere("ATTACKATDAWN", "LEMON")
     'LXFOPVEFRNHR'
     """
-    ciphertext = ""
-    # PUT YOUR CODE HERE
-    keyword_repeated = (keyword * ((len(plaintext) // len(keyword)) + 1))[
-        : len(plaintext)
-    ]
-    for p, k in zip(plaintext, keyword_repeated):
-        if p.isupper():
-            shift = ord(k.upper()) - ord("A")
-            cipher_char = chr((ord(p) - ord("A") + shift) % 26 + ord("A"))
-        elif p.islower():
-            shift = ord(k.lower()) - ord("a")
-            cipher_char = chr((ord(p) - ord("a") + shift) % 26 + ord("a"))
-        else:
-            cipher_char = p
-        ciphertext += cipher_char
-    return ciphertext
+    return compile_vigenere(keyword).encrypt(plaintext)
 
 
 def decrypt_vigenere(ciphertext: str, keyword: str) -> str:
@@ -36,19 +180,111 @@ def decrypt_vigenere(ciphertext: str, keyword: str) -> str:
     >>> decrypt_vigenere("LXFOPVEFRNHR", "LEMON")
     'ATTACKATDAWN'
     """
-    plaintext = ""
-    # PUT YOUR CODE HERE
-    keyword_repeated = (keyword * ((len(ciphertext) // len(keyword)) + 1))[
-        : len(ciphertext)
-    ]
-    for c, k in zip(ciphertext, keyword_repeated):
-        if c.isupper():
-            shift = ord(k.upper()) - ord("A")
-            plain_char = chr((ord(c) - ord("A") - shift + 26) % 26 + ord("A"))
-        elif c.islower():
-            shift = ord(k.lower()) - ord("a")
-            plain_char = chr((ord(c) - ord("a") - shift + 26) % 26 + ord("a"))
+    return compile_vigenere(keyword).decrypt(ciphertext)
+
+
+def encrypt_vigenere_bytes(data: bytes, keyword: str) -> bytes:
+    """
+    >>> encrypt_vigenere_bytes(b"attack at dawn", "lemon")
+    b'lxfopv mh oeib'
+    """
+    return compile_vigenere(keyword).encrypt_bytes(data)
+
+
+def decrypt_vigenere_bytes(data: bytes, keyword: str) -> bytes:
+    """
+    >>> decrypt_vigenere_bytes(b"lxfopv mh oeib", "lemon")
+    b'attack at dawn'
+    """
+    return compile_vigenere(keyword).decrypt_bytes(data)
+
+
+def encrypt_vigenere_into(data: BytesLike, keyword: str, out: tp.Optional[BytesLike] = None) -> int:
+    """
+    >>> out = bytearray(14)
+    >>> encrypt_vigenere_into(b"attack at dawn", "lemon", out)
+    14
+    >>> out
+    bytearray(b'lxfopv mh oeib')
+    """
+    return compile_vigenere(keyword).encrypt_into(data, out)
+
+
+def decrypt_vigenere_into(data: BytesLike, keyword: str, out: tp.Optional[BytesLike] = None) -> int:
+    return compile_vigenere(keyword).decrypt_into(data, out)
+
+
+def _transform_chunks(chunks: tp.Iterable[tp.AnyStr], keyword: str, decrypt: bool) -> tp.Iterator[tp.AnyStr]:
+    key = compile_vigenere(keyword)
+    offset = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield key.decrypt(chunk, offset) if decrypt else key.encrypt(chunk, offset)
         else:
-            plain_char = c
-        plaintext += plain_char
-    return plaintext
+            yield key.decrypt_bytes(chunk, offset) if decrypt else key.encrypt_bytes(chunk, offset)
+        offset = (offset + len(chunk)) % len(key)
+
+
+def iter_encrypt_vigenere(chunks: tp.Iterable[tp.AnyStr], keyword: str) -> tp.Iterator[tp.AnyStr]:
+    """
+    Encrypts a sequence of str or bytes chunks as one continuous text,
+    the keyword position carries over from one chunk to the next.
+
+    >>> "".join(iter_encrypt_vigenere(["ATTA", "CKAT", "DAWN"], "LEMON"))
+    'LXFOPVEFRNHR'
+    """
+    return _transform_chunks(chunks, keyword, decrypt=False)
+
+
+def iter_decrypt_vigenere(chunks: tp.Iterable[tp.AnyStr], keyword: str) -> tp.Iterator[tp.AnyStr]:
+    """
+    >>> b"".join(iter_decrypt_vigenere([b"LXFOP", b"VEFRNHR"], "LEMON"))
+    b'ATTACKATDAWN'
+    """
+    return _transform_chunks(chunks, keyword, decrypt=True)
+
+
+def encrypt_vigenere_stream(src: tp.IO, dst: tp.IO, keyword: str, chunk_size: int = 1 << 16) -> int:
+    """
+    Reads src chunk by chunk and writes the ciphertext to dst.
+
+    Works with both text and binary file objects (dst must be opened
+    in the same mode), memory use is bounded by chunk_size. For binary
+    streams every byte advances the keyword. Returns the number of
+    characters (or bytes) written.
+    """
+    return write_chunks(dst, iter_encrypt_vigenere(read_chunks(src, chunk_size), keyword))
+
+
+def decrypt_vigenere_stream(src: tp.IO, dst: tp.IO, keyword: str, chunk_size: int = 1 << 16) -> int:
+    return write_chunks(dst, iter_decrypt_vigenere(read_chunks(src, chunk_size), keyword))
+
+
+def _transform_batch(items: tp.Iterable[tp.Tuple[str, str]], decrypt: bool) -> tp.List[str]:
+    items = list(items)
+    groups: tp.Dict[str, tp.List[int]] = collections.defaultdict(list)
+    for i, (_, keyword) in enumerate(items):
+        groups[keyword].append(i)
+    results = [""] * len(items)
+    for keyword, indices in groups.items():
+        key = compile_vigenere(keyword)
+        transform = key.decrypt if decrypt else key.encrypt
+        for i in indices:
+            results[i] = transform(items[i][0])
+    return results
+
+
+def encrypt_vigenere_batch(items: tp.Iterable[tp.Tuple[str, str]]) -> tp.List[str]:
+    """
+    Encrypts (plaintext, keyword) pairs, results come back in input order.
+
+    Messages are grouped by keyword, so every key is looked up once per batch.
+
+    >>> encrypt_vigenere_batch([("ATTACKATDAWN", "LEMON"), ("python", "a"), ("ATTACK", "LEMON")])
+    ['LXFOPVEFRNHR', 'python', 'LXFOPV']
+    """
+    return _transform_batch(items, decrypt=False)
+
+
+def decrypt_vigenere_batch(items: tp.Iterable[tp.Tuple[str, str]]) -> tp.List[str]:
+    return _transform_batch(items, decrypt=True)
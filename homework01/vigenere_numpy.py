@@ -0,0 +1,126 @@
+import sys
+import time
+import typing as tp
+
+import numpy as np
+import vigenere
+
+BytesLike = tp.Union[bytes, bytearray, memoryview]
+
+BLOCK_SIZE = 1 << 20
+
+
+def _lookup_tables(keyword: str, decrypt: bool) -> np.ndarray:
+    """One 256-entry byte table per keyword position, built from letter masks and key shifts."""
+    if not keyword:
+        raise ValueError("keyword must not be empty")
+    upper_shifts = np.array([(ord(k.upper()) - ord("A")) % 26 for k in keyword], dtype=np.int16)[:, None]
+    lower_shifts = np.array([(ord(k.lower()) - ord("a")) % 26 for k in keyword], dtype=np.int16)[:, None]
+    if decrypt:
+        upper_shifts = -upper_shifts
+        lower_shifts = -lower_shifts
+    codes = np.arange(256, dtype=np.int16)
+    is_upper = (codes >= ord("A")) & (codes <= ord("Z"))
+    is_lower = (codes >= ord("a")) & (codes <= ord("z"))
+    tables = np.where(is_upper, (codes - ord("A") + upper_shifts) % 26 + ord("A"), codes)
+    tables = np.where(is_lower, (codes - ord("a") + lower_shifts) % 26 + ord("a"), tables)
+    return tables.astype(np.uint8)
+
+
+def _transform(data: BytesLike, keyword: str, decrypt: bool, offset: int, out: tp.Optional[BytesLike]) -> BytesLike:
+    src = np.frombuffer(data, dtype=np.uint8)
+    if out is None:
+        out = bytearray(len(src))
+    dst = np.frombuffer(out, dtype=np.uint8)
+    if len(dst) != len(src):
+        raise ValueError("output buffer must have the same size as the input")
+
+    tables = _lookup_tables(keyword, decrypt)
+    period = len(tables)
+    tables = np.roll(tables, -(offset % period), axis=0)
+    block = max(BLOCK_SIZE // period, 1) * period
+    whole = len(src) - len(src) % period
+
+    # Rows of the reshaped block line up with the keyword, so each column
+    # is a single table lookup over a strided view.
+    for start in range(0, whole, block):
+        stop = min(start + block, whole)
+        rows = src[start:stop].reshape(-1, period)
+        target = dst[start:stop].reshape(-1, period)
+        for column in range(period):
+            target[:, column] = tables[column][rows[:, column]]
+    for column in range(len(src) - whole):
+        dst[whole + column] = tables[column][src[whole + column]]
+    return out
+
+
+def encrypt_vigenere_array(
+    data: BytesLike, keyword: str, offset: int = 0, out: tp.Optional[BytesLike] = None
+) -> BytesLike:
+    """
+    Encrypts ASCII letters in a bytes-like object, other bytes are kept.
+
+    The result is written to out when given (any writable buffer of the
+    same size), otherwise to a new bytearray.
+
+    >>> bytes(encrypt_vigenere_array(b"ATTACKATDAWN", "LEMON"))
+    b'LXFOPVEFRNHR'
+    """
+    return _transform(data, keyword, False, offset, out)
+
+
+def decrypt_vigenere_array(
+    data: BytesLike, keyword: str, offset: int = 0, out: tp.Optional[BytesLike] = None
+) -> BytesLike:
+    """
+    >>> bytes(decrypt_vigenere_array(memoryview(b"LXFOPVEFRNHR"), "LEMON"))
+    b'ATTACKATDAWN'
+    """
+    return _transform(data, keyword, True, offset, out)
+
+
+def _sample(size: int) -> bytes:
+    alphabet = (b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ ,.-\n" * 5)[:256]
+    return np.frombuffer(alphabet, dtype=np.uint8)[np.random.randint(0, 256, size, dtype=np.uint8)].tobytes()
+
+
+def _encrypt_vigenere_reference(plaintext: str, keyword: str) -> str:
+    # The original per-character loop of encrypt_vigenere, kept as the benchmark baseline.
+    ciphertext = []
+    for i, p in enumerate(plaintext):
+        k = keyword[i % len(keyword)]
+        if p.isupper():
+            ciphertext.append(chr((ord(p) - ord("A") + ord(k.upper()) - ord("A")) % 26 + ord("A")))
+        elif p.islower():
+            ciphertext.append(chr((ord(p) - ord("a") + ord(k.lower()) - ord("a")) % 26 + ord("a")))
+        else:
+            ciphertext.append(p)
+    return "".join(ciphertext)
+
+
+def _timeit(func: tp.Callable[[], tp.Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    keyword = sys.argv[2] if len(sys.argv) > 2 else "LEMONADE"
+    data = _sample(size_mb << 20)
+    text = data.decode("ascii")
+
+    # The per-character loop is too slow for the whole sample, it is timed on a prefix.
+    reference_mb = min(size_mb, 4)
+    reference = _timeit(lambda: _encrypt_vigenere_reference(text[: reference_mb << 20], keyword))
+    timings = {
+        "encrypt_vigenere": _timeit(lambda: vigenere.encrypt_vigenere(text, keyword)),
+        "encrypt_vigenere_bytes": _timeit(lambda: vigenere.encrypt_vigenere_bytes(data, keyword)),
+        "encrypt_vigenere_array": _timeit(lambda: encrypt_vigenere_array(data, keyword)),
+    }
+    reference_rate = reference_mb / reference
+    print(f"{size_mb} MB, keyword {keyword!r}, speedup against the per-character loop")
+    print(f"{'per-character loop':24} {reference:8.3f} s {reference_rate:10.1f} MB/s {1:6.1f}x  ({reference_mb} MB)")
+    for name, seconds in timings.items():
+        rate = size_mb / seconds
+        print(f"{name:24} {seconds:8.3f} s {rate:10.1f} MB/s {rate / reference_rate:6.1f}x")
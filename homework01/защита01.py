@@ -1,15 +1,56 @@
-def encrypt_growing_shift(plaintext, start, delta):
-    ciphertext = ''
-    shift = start
-    for char in plaintext:
-        if char.isalpha():
-            if char.isupper():
-                start_ord = ord('А')
-            else:
-                start_ord = ord('а')
-            shifted_char = chr((ord(char) - start_ord + shift) % 32 + start_ord)
+import functools
+import math
+import typing as tp
+
+from alphabet import CYRILLIC, Alphabet, ShiftTable, translate_periodic
+
+
+def _shift_char(char: str, shift: int) -> str:
+    if char.isalpha():
+        if char.isupper():
+            start_ord = ord("А")
         else:
-            shifted_char = char
-        ciphertext += shifted_char
-        shift += delta
-    return ciphertext
+            start_ord = ord("а")
+        return chr((ord(char) - start_ord + shift) % 32 + start_ord)
+    return char
+
+
+@functools.lru_cache(maxsize=None)
+def _shift_table(shift: int, alphabet: tp.Optional[Alphabet]) -> ShiftTable:
+    if alphabet is None:
+        return CYRILLIC.shift_table(shift, fallback=functools.partial(_shift_char, shift=shift))
+    return alphabet.shift_table(shift)
+
+
+def _growing_shift(text: str, start: int, delta: int, alphabet: tp.Optional[Alphabet], sign: int) -> str:
+    size = len(alphabet or CYRILLIC)
+    # start + delta * i repeats modulo size with this period, so each
+    # residue class of positions is one table lookup over a strided slice.
+    period = size // math.gcd(delta, size)
+    tables = [_shift_table(sign * (start + delta * i) % size, alphabet) for i in range(period)]
+    return translate_periodic(text, tables, codec=(alphabet or CYRILLIC).codec)
+
+
+def encrypt_growing_shift(plaintext: str, start: int, delta: int, alphabet: tp.Optional[Alphabet] = None) -> str:
+    """
+    Shifts character i of plaintext by start + delta * i.
+
+    Without an alphabet letters are shifted over the 32 Russian letters
+    and other letters are mapped into them as before. With one, only its
+    letters are shifted.
+
+    >>> encrypt_growing_shift("Привет, мир!", 1, 2)
+    'Рунйоэ, эые!'
+    >>> from alphabet import CYRILLIC_YO
+    >>> encrypt_growing_shift("Ёлка", 0, 1, CYRILLIC_YO)
+    'Ёммг'
+    """
+    return _growing_shift(plaintext, start, delta, alphabet, 1)
+
+
+def decrypt_growing_shift(ciphertext: str, start: int, delta: int, alphabet: tp.Optional[Alphabet] = None) -> str:
+    """
+    >>> decrypt_growing_shift("Рунйоэ, эые!", 1, 2)
+    'Привет, мир!'
+    """
+    return _growing_shift(ciphertext, start, delta, alphabet, -1)
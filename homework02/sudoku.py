@@ -1,11 +1,18 @@
 import pathlib
+import random
 import typing as tp
 
 T = tp.TypeVar("T")
 
+DIGITS = "123456789"
+# Цифра d хранится в маске битом 1 << (d - 1)
+ALL_DIGITS = (1 << len(DIGITS)) - 1
+_BITS = {digit: 1 << i for i, digit in enumerate(DIGITS)}
+_DIGIT_OF_BIT = {bit: digit for digit, bit in _BITS.items()}
+
 
 def read_sudoku(path: tp.Union[str, pathlib.Path]) -> tp.List[tp.List[str]]:
-    """ Прочитать Судоку из указанного файла """
+    """Прочитать Судоку из указанного файла"""
     path = pathlib.Path(path)
     with path.open() as f:
         puzzle = f.read()
@@ -19,15 +26,11 @@ def create_grid(puzzle: str) -> tp.List[tp.List[str]]:
 
 
 def display(grid: tp.List[tp.List[str]]) -> None:
-    """Вывод Судоку """
+    """Вывод Судоку"""
     width = 2
     line = "+".join(["-" * (width * 3)] * 3)
     for row in range(9):
-        print(
-            "".join(
-                grid[row][col].center(width) + ("|" if str(col) in "25" else "") for col in range(9)
-            )
-        )
+        print("".join(grid[row][col].center(width) + ("|" if str(col) in "25" else "") for col in range(9)))
         if str(row) in "25":
             print(line)
     print()
@@ -41,7 +44,7 @@ def group(values: tp.List[T], n: int) -> tp.List[tp.List[T]]:
     >>> group([1,2,3,4,5,6,7,8,9], 3)
     [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
     """
-    pass
+    return [values[i : i + n] for i in range(0, len(values), n)]
 
 
 def get_row(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[str]:
@@ -94,6 +97,87 @@ def get_block(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.List[s
     pass
 
 
+def _block_index(pos: tp.Tuple[int, int]) -> int:
+    return pos[0] // 3 * 3 + pos[1] // 3
+
+
+class SudokuState:
+    """Судоку 9x9 вместе с битовыми масками цифр, стоящих в каждой строке, столбце и квадрате.
+
+    place и remove обновляют маски, столбцы и квадраты сразу, поэтому
+    возможные значения позиции считаются одним битовым выражением, а
+    row, col и block не перебирают сетку.
+
+    Состояние владеет сеткой grid: она меняется на месте, а столбцы и
+    квадраты хранятся отдельно, поэтому после создания состояния сетку
+    можно менять только через place и remove.
+
+    >>> state = SudokuState(read_sudoku('puzzle1.txt'))
+    >>> state.possible_values((0, 2)) == {'1', '2', '4'}
+    True
+    >>> state.place((0, 2), '4')
+    >>> state.col((0, 2))
+    ['4', '.', '8', '.', '.', '.', '.', '.', '.']
+    >>> state.possible_values((1, 1)) == {'2', '7'}
+    True
+    >>> state.remove((0, 2))
+    >>> state.block((0, 2))
+    ['5', '3', '.', '6', '.', '.', '.', '9', '8']
+    """
+
+    def __init__(self, grid: tp.List[tp.List[str]]) -> None:
+        self.grid = grid
+        self.row_masks = [0] * 9
+        self.col_masks = [0] * 9
+        self.block_masks = [0] * 9
+        self.cols = [get_col(grid, (0, col)) for col in range(9)]
+        self.blocks = [get_block(grid, (block // 3 * 3, block % 3 * 3)) for block in range(9)]
+        for row in range(9):
+            for col in range(9):
+                bit = _BITS.get(grid[row][col], 0)
+                self.row_masks[row] |= bit
+                self.col_masks[col] |= bit
+                self.block_masks[_block_index((row, col))] |= bit
+
+    def candidates(self, pos: tp.Tuple[int, int]) -> int:
+        """Маска цифр, которые можно поставить на позицию pos"""
+        row, col = pos
+        return ALL_DIGITS & ~(self.row_masks[row] | self.col_masks[col] | self.block_masks[_block_index(pos)])
+
+    def place(self, pos: tp.Tuple[int, int], value: str) -> None:
+        """Поставить цифру value на свободную позицию pos"""
+        self._set(pos, value, _BITS[value])
+
+    def remove(self, pos: tp.Tuple[int, int]) -> None:
+        """Убрать с позиции pos цифру, поставленную place"""
+        row, col = pos
+        self._set(pos, ".", _BITS[self.grid[row][col]])
+
+    def _set(self, pos: tp.Tuple[int, int], value: str, bit: int) -> None:
+        # place и remove переключают один и тот же бит
+        row, col = pos
+        block = _block_index(pos)
+        self.row_masks[row] ^= bit
+        self.col_masks[col] ^= bit
+        self.block_masks[block] ^= bit
+        self.grid[row][col] = value
+        self.cols[col][row] = value
+        self.blocks[block][row % 3 * 3 + col % 3] = value
+
+    def possible_values(self, pos: tp.Tuple[int, int]) -> tp.Set[str]:
+        candidates = self.candidates(pos)
+        return {digit for digit, bit in _BITS.items() if candidates & bit}
+
+    def row(self, pos: tp.Tuple[int, int]) -> tp.List[str]:
+        return self.grid[pos[0]]
+
+    def col(self, pos: tp.Tuple[int, int]) -> tp.List[str]:
+        return self.cols[pos[1]]
+
+    def block(self, pos: tp.Tuple[int, int]) -> tp.List[str]:
+        return self.blocks[_block_index(pos)]
+
+
 def find_empty_positions(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.Tuple[int, int]]:
     """Найти первую свободную позицию в пазле
     >>> find_empty_positions([['1', '2', '.'], ['4', '5', '6'], ['7', '8', '9']])
@@ -103,7 +187,11 @@ def find_empty_positions(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.Tuple[in
     >>> find_empty_positions([['1', '2', '3'], ['4', '5', '6'], ['.', '8', '9']])
     (2, 0)
     """
-    pass
+    for row, values in enumerate(grid):
+        for col, value in enumerate(values):
+            if value == ".":
+                return row, col
+    return None
 
 
 def find_possible_values(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -> tp.Set[str]:
@@ -116,78 +204,65 @@ def find_possible_values(grid: tp.List[tp.List[str]], pos: tp.Tuple[int, int]) -
     >>> values == {'2', '5', '9'}
     True
     """
-    pass
+    used = 0
+    for value in get_row(grid, pos) + get_col(grid, pos) + get_block(grid, pos):
+        used |= _BITS.get(value, 0)
+    return {digit for digit, bit in _BITS.items() if not used & bit}
 
 
 def solve(grid: tp.List[tp.List[str]]) -> tp.Optional[tp.List[tp.List[str]]]:
-    """ Решение пазла, заданного в grid """
-    """ Как решать Судоку?
+    """Решение пазла, заданного в grid
+
+    Как решать Судоку?
         1. Найти свободную позицию
         2. Найти все возможные значения, которые могут находиться на этой позиции
         3. Для каждого возможного значения:
             3.1. Поместить это значение на эту позицию
             3.2. Продолжить решать оставшуюся часть пазла
+
+    Свободные позиции перебираются по порядку, возможные значения берутся
+    из масок SudokuState.
+
     >>> grid = read_sudoku('puzzle1.txt')
     >>> solve(grid)
     [['5', '3', '4', '6', '7', '8', '9', '1', '2'], ['6', '7', '2', '1', '9', '5', '3', '4', '8'], ['1', '9', '8', '3', '4', '2', '5', '6', '7'], ['8', '5', '9', '7', '6', '1', '4', '2', '3'], ['4', '2', '6', '8', '5', '3', '7', '9', '1'], ['7', '1', '3', '9', '2', '4', '8', '5', '6'], ['9', '6', '1', '5', '3', '7', '2', '8', '4'], ['2', '8', '7', '4', '1', '9', '6', '3', '5'], ['3', '4', '5', '2', '8', '6', '1', '7', '9']]
     """
+    state = SudokuState(grid)
+    empty = [(row, col) for row in range(9) for col in range(9) if grid[row][col] == "."]
 
-    def find_empty(grid):
-        for i in range(len(grid)):
-            for j in range(len(grid[0])):
-                if grid[i][j] == '.':
-                    return (i, j)
-        return None
-
-    def is_valid(grid, num, pos):
-        if num in grid[pos[0]]:
-            return False
-        if num in [grid[i][pos[1]] for i in range(len(grid))]:
-            return False
-        row_start = (pos[0] // 3) * 3
-        col_start = (pos[1] // 3) * 3
-        for i in range(row_start, row_start + 3):
-            for j in range(col_start, col_start + 3):
-                if grid[i][j] == num:
-                    return False
-        return True
-
-    def solve():
-        empty = find_empty(grid)
-        if not empty:
+    def fill(index: int) -> bool:
+        if index == len(empty):
             return True
-        row, col = empty
-        for num in range(1, 10):
-            if is_valid(grid, str(num), (row, col)):
-                grid[row][col] = str(num)
-                if solve():
-                    return True
-                grid[row][col] = '.'
-
+        pos = empty[index]
+        candidates = state.candidates(pos)
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            state.place(pos, _DIGIT_OF_BIT[bit])
+            if fill(index + 1):
+                return True
+            state.remove(pos)
         return False
-    if solve():
+
+    if fill(0):
         return grid
-    else:
-        return None
-    pass
+    return None
 
 
 def check_solution(solution: tp.List[tp.List[str]]) -> bool:
-    """ Если решение solution верно, то вернуть True, в противном случае False """
-    # TODO: Add doctests with bad puzzles
-    grid = read_sudoku("sudoku_puzzle.txt")
-    solution = solve(grid)
-    if solution:
-        is_valid_solution = check_solution(solution)
-        if is_valid_solution:
-            print("Решение верно!")
-            for row in solution:
-                print(row)
-        else:
-            print("Решение некорректно!")
-    else:
-        print("Решение не найдено.")
-    pass
+    """Если решение solution верно, то вернуть True, в противном случае False
+    >>> check_solution(solve(read_sudoku('puzzle1.txt')))
+    True
+    >>> check_solution([[str(v) for v in range(1, 10)]] * 9)
+    False
+    """
+    expected = set(DIGITS)
+    for i in range(9):
+        if set(get_row(solution, (i, 0))) != expected or set(get_col(solution, (0, i))) != expected:
+            return False
+        if set(get_block(solution, (i // 3 * 3, i % 3 * 3))) != expected:
+            return False
+    return True
 
 
 def generate_sudoku(N: int) -> tp.List[tp.List[str]]:
@@ -211,55 +286,16 @@ def generate_sudoku(N: int) -> tp.List[tp.List[str]]:
     >>> check_solution(solution)
     True
     """
-    import typing as tp
-    import random
-        def is_valid(grid, num, pos):
-            if num in grid[pos[0]]:
-                return False
-            if num in [grid[i][pos[1]] for i in range(len(grid))]:
-                return False
-            row_start = (pos[0] // 3) * 3
-            col_start = (pos[1] // 3) * 3
-            for i in range(row_start, row_start + 3):
-                for j in range(col_start, col_start + 3):
-                    if grid[i][j] == num:
-                        return False
-            return True
-
-        def fill_grid(grid, count):
-            empty = find_empty(grid)
-            if not empty:
-                return True
-            row, col = empty
-            numbers = [str(i) for i in range(1, 10)]
-            random.shuffle(numbers)
-            for num in numbers:
-                if is_valid(grid, num, (row, col)):
-                    grid[row][col] = num
-                    if fill_grid(grid, count - 1):
-                        return True
-                    grid[row][col] = '.'
-            return False
-
-        def find_empty(grid):
-            for i in range(len(grid)):
-                for j in range(len(grid[0])):
-                    if grid[i][j] == '.':
-                        return (i, j)
-            return None
-
-        grid = [['.' for _ in range(9)] for _ in range(9)]
-        if fill_grid(grid, 81 - N):
-            return grid
-        else:
-            return [['.' for _ in range(9)] for _ in range(9)]
-
-    # Пример использования:
-    grid = generate_sudoku(40)
-    print(sum(1 for row in grid for e in row if e == '.'))  # Должно быть 41
-    solution = solve(grid)
-    print(check_solution(solution))  # Должно быть True
-    pass
+    solved = tp.cast(tp.List[tp.List[str]], solve([["."] * 9 for _ in range(9)]))
+    # Перестановка цифр решённого судоку тоже даёт решённое судоку
+    digits = list(DIGITS)
+    random.shuffle(digits)
+    relabel = dict(zip(DIGITS, digits))
+    grid = [[relabel[value] for value in row] for row in solved]
+    positions = [(row, col) for row in range(9) for col in range(9)]
+    for row, col in random.sample(positions, 81 - min(max(N, 0), 81)):
+        grid[row][col] = "."
+    return grid
 
 
 if __name__ == "__main__":
@@ -270,4 +306,4 @@ if __name__ == "__main__":
         if not solution:
             print(f"Puzzle {fname} can't be solved")
         else:
-            display(solution)
\ No newline at end of file
+            display(solution)
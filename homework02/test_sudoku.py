@@ -239,4 +239,42 @@ class SudokuTestCase(unittest.TestCase):
         self.assertEqual(expected_unknown, actual_unknown)
         solution = sudoku.solve(grid)
         solved = sudoku.check_solution(solution)
-        self.assertTrue(solved)
\ No newline at end of file
+        self.assertTrue(solved)
+
+
+class SudokuStateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.grid = sudoku.create_grid(
+            "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+        )
+        self.state = sudoku.SudokuState(self.grid)
+
+    def test_possible_values_match_find_possible_values(self):
+        for row in range(9):
+            for col in range(9):
+                if self.grid[row][col] == ".":
+                    self.assertEqual(
+                        sudoku.find_possible_values(self.grid, (row, col)),
+                        self.state.possible_values((row, col)),
+                    )
+
+    def test_place_and_remove(self):
+        masks = (list(self.state.row_masks), list(self.state.col_masks), list(self.state.block_masks))
+        self.state.place((0, 2), "4")
+        self.assertEqual("4", self.grid[0][2])
+        self.assertNotIn("4", self.state.possible_values((0, 3)))
+        self.assertNotIn("4", self.state.possible_values((5, 2)))
+        self.assertNotIn("4", self.state.possible_values((1, 1)))
+        self.assertEqual(sudoku.get_col(self.grid, (0, 2)), self.state.col((0, 2)))
+        self.assertEqual(sudoku.get_block(self.grid, (0, 2)), self.state.block((0, 2)))
+        self.state.remove((0, 2))
+        self.assertEqual(".", self.grid[0][2])
+        self.assertEqual(masks, (self.state.row_masks, self.state.col_masks, self.state.block_masks))
+
+    def test_views_follow_grid(self):
+        for row in range(9):
+            for col in range(9):
+                pos = (row, col)
+                self.assertEqual(sudoku.get_row(self.grid, pos), self.state.row(pos))
+                self.assertEqual(sudoku.get_col(self.grid, pos), self.state.col(pos))
+                self.assertEqual(sudoku.get_block(self.grid, pos), self.state.block(pos))